@@ -0,0 +1,94 @@
+# article_store.py
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+# 연합뉴스 기사 ID (예: https://www.yna.co.kr/view/AKR20250907012300009)
+YONHAP_ID_PATTERN = re.compile(r'/view/(AKR\d+)')
+
+
+def yonhap_article_id(url):
+    """연합뉴스 기사 URL에서 기사 ID 추출 (없으면 쿼리 문자열을 뗀 URL 사용)"""
+    match = YONHAP_ID_PATTERN.search(url)
+    if match:
+        return match.group(1)
+    return url.split('?', 1)[0].split('#', 1)[0]
+
+
+class ArticleStore:
+    """이미 가져온 연합뉴스 기사를 기억하는 SQLite 저장소"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS articles (
+                article_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                link TEXT NOT NULL,
+                published TEXT NOT NULL,
+                summary TEXT,
+                fetched_at TEXT NOT NULL
+            )
+        """)
+        # 시간 범위 조회용 인덱스 (published는 KST ISO 문자열이라 문자열 정렬 = 시간 정렬)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published)")
+        self._conn.commit()
+
+    def get(self, url):
+        """저장된 기사 조회 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, link, published, summary, fetched_at FROM articles WHERE article_id = ?",
+                (yonhap_article_id(url),),
+            ).fetchone()
+        return self._to_article(row) if row else None
+
+    def save(self, article):
+        """기사 저장 (같은 기사 ID면 덮어씀)"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO articles (article_id, title, link, published, summary, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    yonhap_article_id(article['link']),
+                    article['title'],
+                    article['link'],
+                    article['published'].isoformat(),
+                    article.get('content'),
+                    datetime.now(article['published'].tzinfo).isoformat(),
+                ),
+            )
+            self._conn.commit()
+
+    def articles_between(self, start, end):
+        """발행 시각이 start ~ end 인 기사를 최신순으로 조회 (네트워크 없이 다이제스트 재구성용)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT title, link, published, summary, fetched_at FROM articles "
+                "WHERE published BETWEEN ? AND ? ORDER BY published DESC",
+                (start.isoformat(), end.isoformat()),
+            ).fetchall()
+        return [self._to_article(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _to_article(row):
+        title, link, published, summary, fetched_at = row
+        return {
+            'title': title,
+            'link': link,
+            'published': datetime.fromisoformat(published),
+            'content': summary,
+            'fetched_at': datetime.fromisoformat(fetched_at),
+        }
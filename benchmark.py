@@ -0,0 +1,414 @@
+# benchmark.py
+"""녹화된 페이지 스냅샷으로 사이트별 파서 성능을 오프라인 측정
+
+    python benchmark.py record                    # 실제 사이트 응답을 스냅샷으로 저장
+    python benchmark.py run                       # 스냅샷 재생 + 기준값과 비교 (느려지면 종료 코드 1)
+    python benchmark.py run --update-baseline     # 현재 결과를 기준값으로 저장
+    python benchmark.py transport                 # 로컬 서버로 requests(HTTP/1.1)와 HTTP/2 전송 비교
+    python benchmark.py imports                   # 모듈 import 시간 예산 확인 (넘으면 종료 코드 1)
+    python benchmark.py clusters                  # 속보/갱신판 묶기 회귀 확인 (틀리면 종료 코드 1)
+    python benchmark.py smtp                      # 거부되는 수신자가 다른 수신자 발송을 막지 않는지 확인
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from main import NewsCrawler
+from email_sender import NewsEmailSender
+from metrics import metrics
+from http_client import HttpClient
+from local_servers import Http1StandIn, H2StandIn, SmtpStandIn
+from replay import RecordingSession, ReplaySession
+from story_clusters import cluster_titles
+
+SNAPSHOT_DIR = os.path.join('benchmarks', 'snapshots')
+BASELINE_FILE = os.path.join('benchmarks', 'baseline.json')
+
+HEADLINE_URLS = {
+    'bbc': "https://www.bbc.com/news",
+    'cnn': "https://www.cnn.com/",
+    'fox': "https://www.foxnews.com/",
+    'nyt': "https://www.nytimes.com/",
+    # 임베디드 JSON(__NEXT_DATA__) 경로 - 재생 중에는 브라우저로 넘어가지 않음
+    'wp': "https://www.washingtonpost.com/",
+}
+
+# 이보다 작은 시간 차이는 측정 오차로 보고 무시
+MIN_TIME_DELTA_MS = 1.0
+
+# 모듈별 import 시간 예산 (ms) - CLI(main), 데몬, 이메일 렌더링만 하는 테스트의 시작 시간
+IMPORT_BUDGETS_MS = {
+    'main': 250,
+    'daemon': 250,
+    'email_sender': 100,
+}
+
+# import만으로는 로드되면 안 되는 무거운 패키지 (실제로 쓸 때 가져와야 함)
+HEAVY_PACKAGES = ('selenium', 'bs4', 'soupsieve', 'lxml', 'selectolax', 'httpx', 'h2')
+
+# 같은 기사의 갱신판으로 묶여야 하는 제목 쌍
+SAME_STORY_TITLES = [
+    ('美 연준 기준금리 동결(1보)', '美 연준 기준금리 동결…파월 "서두르지 않아"(종합)'),
+    ('美 연준 기준금리 동결(1보)', '美 연준, 기준금리 동결'),
+    ('트럼프 "中에 100% 추가 관세"(1보)', '트럼프 "中에 100% 추가 관세"…미중 무역전쟁 재점화'),
+    ('트럼프 "中에 100% 추가 관세"(1보)', '트럼프, 中에 100% 추가관세 부과 발표(종합2보)'),
+    ('日 이시바 총리 사임 표명', '日 이시바 총리 사임 표명…"당 분열 막기 위해"(종합)'),
+    ('[속보] 北, 동해상으로 탄도미사일 발사', '北, 동해상으로 탄도미사일 발사(2보)'),
+]
+# 제목은 비슷하지만 다른 기사 (한 단어/숫자만 다르거나 기사 종류가 다름)
+DIFFERENT_STORY_TITLES = [
+    ('[그래픽] 미국 소비자물가 상승률 추이', '[그래픽] 미국 생산자물가 상승률 추이'),
+    ('뉴욕증시, 기술주 강세에 상승 마감', '뉴욕증시, 기술주 약세에 하락 마감'),
+    ('우크라 "러시아 드론 100대 격추"', '우크라 "러시아 드론 50대 격추"'),
+    ('美 연준 기준금리 동결(1보)', '[그래픽] 美 연준 기준금리 동결'),
+    ('[사진] 美 연준 기준금리 동결', '[그래픽] 美 연준 기준금리 동결'),
+]
+
+YONHAP_LISTING_PREFIX = 'https://www.yna.co.kr/international/all/'
+YONHAP_ARTICLE_PREFIX = 'https://www.yna.co.kr/view/'
+
+
+def record(snapshot_dir):
+    """실제 사이트를 크롤링하면서 모든 응답을 스냅샷으로 저장"""
+    crawler = NewsCrawler(cache_path=None, store_path=None)
+    crawler.streaming = False
+    crawler.session = RecordingSession(snapshot_dir)
+    crawler.session.headers.update(crawler.headers)
+
+    crawler.crawl_bbc_headline()
+    crawler.crawl_cnn_headline()
+    crawler.crawl_fox_headline()
+    crawler.crawl_nyt_headline()
+    # Washington Post는 브라우저 대신 원본 HTML만 저장
+    crawler.session.get("https://www.washingtonpost.com/")
+    crawler.crawl_yonhap_request()
+
+    print(f"\n✅ 스냅샷 {len(crawler.session.index['pages'])}개 저장: {snapshot_dir}")
+
+
+def build_cases(crawler, session):
+    """측정 대상: (메서드 이름, 페이지 URL, 호출 함수) 목록"""
+    cases = []
+    for site, url in HEADLINE_URLS.items():
+        if session.has(url):
+            cases.append((f'crawl_{site}_headline', url, getattr(crawler, f'crawl_{site}_headline')))
+
+    listing_parser = crawler.parsers['yonhap_listing']
+    for url in session.urls(YONHAP_LISTING_PREFIX):
+        body = session.body(url)
+        cases.append(('parse_yonhap_listing', url,
+                      lambda body=body: crawler.parse_yonhap_listing(listing_parser.parse(body))))
+
+    for url in session.urls(YONHAP_ARTICLE_PREFIX):
+        body = session.body(url)
+        cases.append(('extract_yonhap_summary', url,
+                      lambda body=body: crawler.extract_yonhap_summary(body)))
+    return cases
+
+
+def measure(func, repeat):
+    """실행 시간(중앙값), 최대 메모리, 호출 후 남은 메모리 블록 수 측정"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    # 메모리는 시간 측정과 분리해서 한 번만 (tracemalloc은 실행을 느리게 함)
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks_after = sys.getallocatedblocks()
+
+    return {
+        'time_ms': statistics.median(timings) * 1000,
+        'peak_kb': (peak - before) / 1024,
+        'net_blocks': blocks_after - blocks_before,
+    }
+
+
+def run(snapshot_dir, repeat):
+    """스냅샷을 재생하며 메서드별 페이지당 평균 지표 계산"""
+    session = ReplaySession(snapshot_dir)
+    if not session.index['pages']:
+        raise SystemExit(f"❌ 스냅샷이 없음: {snapshot_dir} (먼저 'python benchmark.py record' 실행)")
+
+    crawler = NewsCrawler(cache_path=None, store_path=None, min_interval=0, host_intervals={})
+    crawler.session = session
+    # WP 임베디드 JSON 추출이 실패하면 브라우저를 띄우지 않고 None (아래 결과 확인에서 걸러짐)
+    crawler.crawl_wp_headline_selenium = lambda: None
+
+    per_method = {}
+    failures = []
+    for name, url, func in build_cases(crawler, session):
+        # 크롤러의 print 출력은 숨기고, 단계별 지표도 쌓이지 않게 해서 페이지당 메모리 블록 수에서 뺌
+        with contextlib.redirect_stdout(io.StringIO()), metrics.disabled():
+            # 헤드라인 메서드는 예외를 삼키고 None을 반환하므로 추출이 깨진 채로 측정되지 않게 먼저 확인
+            if name.endswith('_headline') and func() is None:
+                failures.append(f"{name}: {url}")
+                continue
+            result = measure(func, repeat)
+        per_method.setdefault(name, []).append(result)
+
+    if failures:
+        raise SystemExit("❌ 스냅샷에서 헤드라인을 찾지 못함:\n" + '\n'.join(f"  {line}" for line in failures))
+
+    results = {}
+    for name, samples in per_method.items():
+        results[name] = {
+            'pages': len(samples),
+            'time_ms': statistics.mean(s['time_ms'] for s in samples),
+            'peak_kb': statistics.mean(s['peak_kb'] for s in samples),
+            'net_blocks': statistics.mean(s['net_blocks'] for s in samples),
+        }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """기준값보다 tolerance 이상 나빠진 항목 목록"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric in ('time_ms', 'peak_kb'):
+            if metric == 'time_ms' and result[metric] - base[metric] < MIN_TIME_DELTA_MS:
+                continue
+            if base[metric] > 0 and result[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{name}.{metric}: {base[metric]:.2f} → {result[metric]:.2f}")
+    return regressions
+
+
+def print_table(results, baseline):
+    print(f"{'메서드':<28}{'페이지':>6}{'시간(ms)':>12}{'기준(ms)':>12}{'최대 메모리(KB)':>18}{'남은 블록':>12}")
+    for name, result in results.items():
+        base = baseline.get(name, {}).get('time_ms')
+        base_text = f"{base:.2f}" if base is not None else '-'
+        print(f"{name:<28}{result['pages']:>6}{result['time_ms']:>12.2f}{base_text:>12}"
+              f"{result['peak_kb']:>18.1f}{result['net_blocks']:>12.0f}")
+
+
+def fetch_yonhap_like(session, base_url, articles, workers):
+    """연합뉴스 크롤링과 같은 모양의 요청 (목록 1개 + 기사 여러 개를 workers개 동시에)"""
+    client = HttpClient(session, hedge_after=None)
+    start = time.perf_counter()
+    client.get(f"{base_url}/international/all/1").content
+    urls = [f"{base_url}/view/AKR{i:011d}" for i in range(articles)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        sizes = list(executor.map(lambda url: len(client.get(url).content), urls))
+    elapsed = time.perf_counter() - start
+    client.close()
+    return elapsed, sum(sizes)
+
+
+def run_transport(articles, workers, latency, body_kb):
+    """같은 지연을 가진 로컬 HTTP/1.1, HTTP/2 서버에 대해 전송 방식별 소요 시간/연결 수 비교"""
+    from http2_transport import Http2Session
+
+    body = b'<p>' + b'x' * (body_kb * 1024) + b'</p>'
+    results = []
+
+    with Http1StandIn(body, latency) as server:
+        session = requests.Session()
+        elapsed, size = fetch_yonhap_like(session, server.url, articles, workers)
+        session.close()
+        results.append(('requests (HTTP/1.1)', elapsed, server.connections, size))
+
+    with H2StandIn(body, latency) as server:
+        session = Http2Session(http1=False)
+        elapsed, size = fetch_yonhap_like(session, server.url, articles, workers)
+        session.close()
+        results.append(('httpx (HTTP/2)', elapsed, server.connections, size))
+
+    print(f"요청 {articles + 1}개, 동시 {workers}개, 응답 지연 {latency * 1000:.0f}ms, 본문 {body_kb}KB")
+    print(f"{'전송':<22}{'시간(초)':>10}{'연결 수':>10}{'받은 바이트':>14}")
+    for name, elapsed, connections, size in results:
+        print(f"{name:<22}{elapsed:>10.2f}{connections:>10}{size:>14,}")
+
+
+def measure_import(module, repeat):
+    """새 인터프리터에서 python -X importtime으로 모듈 import 누적 시간(ms, 최솟값)과 로드된 최상위 패키지 측정"""
+    times = []
+    packages = set()
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        if result.returncode != 0:
+            raise SystemExit(f"❌ {module} import 실패:\n{result.stderr[-2000:]}")
+        for line in result.stderr.splitlines():
+            # "import time: self [us] | cumulative | imported package" (들여쓰기로 중첩 표시)
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = line.split('|')
+            packages.add(name.strip().split('.')[0])
+            if name == f' {module}':
+                times.append(int(cumulative) / 1000)
+    return min(times), packages
+
+
+def check_imports(repeat, scale):
+    """모듈별 import 시간이 예산(scale배) 안인지, 무거운 패키지를 미리 가져오지 않는지 확인"""
+    violations = []
+    print(f"{'모듈':<16}{'import(ms)':>12}{'예산(ms)':>12}  무거운 패키지")
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        elapsed, packages = measure_import(module, repeat)
+        budget *= scale
+        heavy = sorted(packages.intersection(HEAVY_PACKAGES))
+        print(f"{module:<16}{elapsed:>12.1f}{budget:>12.0f}  {', '.join(heavy) or '-'}")
+        if elapsed > budget:
+            violations.append(f"{module}: {elapsed:.1f}ms > {budget:.0f}ms")
+        if heavy:
+            violations.append(f"{module}: import 시점에 {', '.join(heavy)} 로드")
+    return violations
+
+
+def check_clusters():
+    """알려진 제목 쌍이 따로, 그리고 한 목록에 섞여 있을 때도 기대대로 묶이는지 확인"""
+    violations = []
+    cases = [(pair, True) for pair in SAME_STORY_TITLES] + [(pair, False) for pair in DIFFERENT_STORY_TITLES]
+    for (a, b), same in cases:
+        if (len(cluster_titles([a, b])) == 1) != same:
+            violations.append(f"{'묶이지 않음' if same else '잘못 묶임'}: {a} / {b}")
+
+    # 섞인 목록에서는 같은 제목이 여러 쌍에 나오므로 쌍 단위로 같은 묶음인지 확인
+    titles = list(dict.fromkeys(title for (a, b), _ in cases for title in (a, b)))
+    cluster_of = {}
+    for number, members in enumerate(cluster_titles(titles)):
+        for i in members:
+            cluster_of[titles[i]] = number
+    for (a, b), same in cases:
+        if (cluster_of[a] == cluster_of[b]) != same:
+            violations.append(f"목록에서 {'묶이지 않음' if same else '잘못 묶임'}: {a} / {b}")
+    print(f"제목 쌍 {len(cases)}개 (같은 기사 {len(SAME_STORY_TITLES)}, 다른 기사 {len(DIFFERENT_STORY_TITLES)})")
+    return violations
+
+
+def check_smtp():
+    """로컬 SMTP에서 수신자 하나가 거부돼도 나머지 수신자는 모두 받는지 확인 (거부 후 트랜잭션 초기화)"""
+    recipients = ['a@example.com', 'bad@example.com', 'c@example.com', 'd@example.com']
+    rejected = {'bad@example.com'}
+    with SmtpStandIn(rejected) as server:
+        sender = NewsEmailSender(smtp_server=server.host, smtp_port=server.port, use_starttls=False)
+        sender.email = 'digest@example.com'
+        sender.password = None
+        sender.recipients = recipients
+        with contextlib.redirect_stdout(io.StringIO()), metrics.disabled():
+            sender.send_email({'BBC': {'title': 'headline', 'link': 'https://www.bbc.com/news'}}, [])
+        delivered = [address for addresses, _ in server.delivered for address in addresses]
+
+    expected = [address for address in recipients if address not in rejected]
+    print(f"수신자 {len(recipients)}명 (거부 {len(rejected)}명) → 발송 {len(delivered)}명: {', '.join(delivered)}")
+    if delivered != expected:
+        return [f"발송된 수신자 {delivered} (기대값 {expected})"]
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="사이트별 파서 오프라인 벤치마크")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help="실제 사이트 응답을 스냅샷으로 저장")
+    record_parser.add_argument('--snapshots', default=SNAPSHOT_DIR)
+
+    run_parser = subparsers.add_parser('run', help="스냅샷 재생 벤치마크")
+    run_parser.add_argument('--snapshots', default=SNAPSHOT_DIR)
+    run_parser.add_argument('--baseline', default=BASELINE_FILE)
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--tolerance', type=float, default=0.25,
+                            help="기준값 대비 허용 비율 (기본 0.25 = 25%%)")
+    run_parser.add_argument('--update-baseline', action='store_true')
+
+    transport_parser = subparsers.add_parser('transport', help="로컬 서버로 HTTP/1.1과 HTTP/2 전송 비교")
+    transport_parser.add_argument('--articles', type=int, default=50)
+    transport_parser.add_argument('--workers', type=int, default=4)
+    transport_parser.add_argument('--latency', type=float, default=0.05, help="응답 지연(초)")
+    transport_parser.add_argument('--body-kb', type=int, default=40)
+
+    imports_parser = subparsers.add_parser('imports', help="모듈 import 시간 예산 확인")
+    imports_parser.add_argument('--repeat', type=int, default=5, help="측정 횟수 (최솟값 사용)")
+    imports_parser.add_argument('--scale', type=float, default=1.0,
+                                help="예산 배율 (느린 CI 머신에서는 1.5 등)")
+
+    subparsers.add_parser('clusters', help="속보/갱신판 묶기 회귀 확인")
+    subparsers.add_parser('smtp', help="로컬 SMTP로 거부된 수신자 처리 확인")
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record(args.snapshots)
+        return
+
+    if args.command == 'transport':
+        run_transport(args.articles, args.workers, args.latency, args.body_kb)
+        return
+
+    if args.command == 'imports':
+        violations = check_imports(args.repeat, args.scale)
+        if violations:
+            print("\n❌ import 예산 초과:")
+            for line in violations:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\n✅ import 예산 안")
+        return
+
+    if args.command == 'clusters':
+        violations = check_clusters()
+        if violations:
+            print("\n❌ 묶기 결과가 다름:")
+            for line in violations:
+                print(f"  {line}")
+            sys.exit(1)
+        print("✅ 묶기 결과 일치")
+        return
+
+    if args.command == 'smtp':
+        violations = check_smtp()
+        if violations:
+            print("\n❌ 발송 결과가 다름:")
+            for line in violations:
+                print(f"  {line}")
+            sys.exit(1)
+        print("✅ 거부된 수신자만 빠지고 나머지는 발송됨")
+        return
+
+    results = run(args.snapshots, args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print_table(results, baseline)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or '.', exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ 기준값 저장: {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\n❌ 성능 저하:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("\n✅ 기준값 대비 성능 저하 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# browser_pool.py
+import threading
+from contextlib import contextmanager
+
+# selenium은 가져오는 데만 0.1초 넘게 걸리므로 브라우저를 실제로 쓸 때 가져옴
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36'
+
+# 헤드라인 추출에 필요 없는 리소스 (CDP Network.setBlockedURLs 패턴)
+DEFAULT_BLOCKED_URLS = [
+    # 이미지, 폰트, 미디어
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.m3u8',
+    # 광고/분석 등 서드파티 도메인
+    '*doubleclick.net*', '*googlesyndication.com*', '*googletagmanager.com*',
+    '*google-analytics.com*', '*googletagservices.com*', '*amazon-adsystem.com*',
+    '*facebook.net*', '*scorecardresearch.com*', '*chartbeat.com*', '*chartbeat.net*',
+    '*adsafeprotected.com*', '*criteo.com*', '*criteo.net*', '*taboola.com*',
+    '*outbrain.com*', '*moatads.com*', '*krxd.net*', '*pubmatic.com*',
+]
+
+
+class BrowserPool:
+    """헤드리스 Chrome 하나를 띄워 두고 요청마다 새 탭을 빌려주는 풀"""
+
+    def __init__(self, user_agent=USER_AGENT, blocked_urls=None, page_load_timeout=30):
+        self.user_agent = user_agent
+        self.blocked_urls = DEFAULT_BLOCKED_URLS if blocked_urls is None else blocked_urls
+        self.page_load_timeout = page_load_timeout
+        self._driver = None
+        self._base_handle = None
+        # WebDriver는 스레드 안전하지 않으므로 탭은 한 번에 하나씩
+        self._lock = threading.Lock()
+
+    def _build_options(self):
+        """Chrome 옵션 설정"""
+        from selenium.webdriver.chrome.options import Options
+
+        chrome_options = Options()
+        chrome_options.add_argument('--headless')  # 브라우저 창 숨기기
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--window-size=1920,1080')
+        chrome_options.add_argument(f'--user-agent={self.user_agent}')
+        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        # 이미지 로딩 끄기
+        chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        # driver.get이 로딩 완료를 기다리지 않음 - 필요한 요소만 wait_for로 기다림
+        chrome_options.page_load_strategy = 'none'
+        return chrome_options
+
+    def _ensure_driver(self):
+        """브라우저가 없거나 죽었으면 새로 띄움 (락 안에서 호출)"""
+        from selenium import webdriver
+        from selenium.common.exceptions import WebDriverException
+
+        if self._driver is not None:
+            try:
+                self._driver.switch_to.window(self._base_handle)
+                return self._driver
+            except WebDriverException:
+                self._quit_driver()
+
+        driver = webdriver.Chrome(options=self._build_options())
+        driver.set_page_load_timeout(self.page_load_timeout)
+        self._driver = driver
+        self._base_handle = driver.current_window_handle
+        return driver
+
+    def _prepare_tab(self, driver):
+        """새 탭에 리소스 차단과 자동화 흔적 제거 적용 (CDP는 현재 탭 기준)"""
+        driver.execute_cdp_cmd('Network.enable', {})
+        if self.blocked_urls:
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_urls})
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+            'source': "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+        })
+
+    @contextmanager
+    def page(self):
+        """새 탭을 열어 driver를 넘겨주고, 끝나면 탭만 닫음 (브라우저는 유지)"""
+        from selenium.common.exceptions import WebDriverException
+
+        with self._lock:
+            driver = self._ensure_driver()
+            driver.switch_to.new_window('tab')
+            try:
+                self._prepare_tab(driver)
+                yield driver
+            finally:
+                try:
+                    driver.close()
+                    driver.switch_to.window(self._base_handle)
+                except WebDriverException:
+                    # 브라우저가 죽었으면 다음 요청 때 새로 띄움
+                    self._quit_driver()
+
+    def wait_for(self, driver, selector, timeout=10):
+        """CSS 선택자에 맞는 요소가 나타날 때까지 대기"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        wait = WebDriverWait(driver, timeout)
+        return wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+
+    def _quit_driver(self):
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception:
+                pass
+        self._driver = None
+        self._base_handle = None
+
+    def close(self):
+        """브라우저 종료"""
+        with self._lock:
+            self._quit_driver()
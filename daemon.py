@@ -0,0 +1,127 @@
+# daemon.py
+"""데몬 모드: 크롤러(HTTP 연결, 캐시, 컴파일된 선택자, 브라우저)를 띄워 둔 채 매일 정해진 시각에 발송
+
+    python main.py --serve                      # 매일 08:30 (KST) 발송, 밤사이 15분마다 연합뉴스 미리 가져오기
+    python main.py --serve --send-at 07:00 --poll-interval 0
+"""
+import signal
+import threading
+from datetime import datetime, timedelta
+
+from email_sender import NewsEmailSender
+from digest_archive import DigestArchive
+from main import NewsCrawler, run_digest, KST, ARCHIVE_PATH
+from metrics import metrics
+
+
+def next_send_time(now, send_at):
+    """now 이후 처음 오는 발송 시각 (send_at은 KST (시, 분))"""
+    hour, minute = send_at
+    send_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if send_time <= now:
+        send_time += timedelta(days=1)
+    return send_time
+
+
+class DigestDaemon:
+    """프로세스 안에서 발송/미리 가져오기 일정을 돌리는 스케줄러"""
+
+    # 발송 시각 몇 분 전에 마지막으로 미리 가져옴
+    PREPARE_BEFORE = timedelta(minutes=3)
+    # 미리 가져오기 한 번의 최대 소요 시간 (초)
+    POLL_DEADLINE = 300
+    # 시계 변경/절전 복귀에 대비해 최대 이 간격으로 일정을 다시 확인
+    MAX_SLEEP = 60
+
+    def __init__(self, crawler, email_sender, send_at=(8, 30), poll_interval=900,
+                 sequential=False, deadline_seconds=600, archive=None):
+        self.crawler = crawler
+        self.email_sender = email_sender
+        self.archive = archive
+        self.send_at = send_at
+        # 0이면 밤사이 미리 가져오기 없이 발송 시각에만 크롤링
+        self.poll_interval = poll_interval
+        self.sequential = sequential
+        self.deadline_seconds = deadline_seconds
+        self._stop = threading.Event()
+
+    def stop(self, *args):
+        """현재 작업이 끝나면 종료 (SIGTERM/SIGINT 처리기로도 사용)"""
+        self._stop.set()
+
+    def poll(self, send_time):
+        """다음 발송분 연합뉴스 본문을 미리 가져옴 (실패해도 발송 일정은 유지)"""
+        # 발송 시각을 넘기지 않도록 마감 시각 제한
+        remaining = (send_time - datetime.now(KST)).total_seconds()
+        try:
+            self.crawler.poll_yonhap(send_time, deadline_seconds=max(1.0, min(self.POLL_DEADLINE, remaining)))
+        except Exception as e:
+            print(f"❌ 연합뉴스 미리 가져오기 실패: {e}")
+
+    def prepare(self, send_time):
+        """발송 직전 준비: 마지막 미리 가져오기 (브라우저는 WP 임베디드 JSON 추출이 실패할 때만 띄움)"""
+        self.poll(send_time)
+
+    def send(self):
+        print(f"\n=== 일일 뉴스 크롤링 시작 ({datetime.now(KST):%Y-%m-%d %H:%M} KST) ===")
+        try:
+            run_digest(self.crawler, self.email_sender, sequential=self.sequential,
+                       deadline_seconds=self.deadline_seconds, archive=self.archive)
+        except Exception as e:
+            print(f"❌ 일일 브리핑 실패: {e}")
+
+    def serve_forever(self):
+        """stop()이 불릴 때까지 발송 시각마다 브리핑 발송, 그 사이 밤 시간에는 poll_interval마다 미리 가져오기"""
+        send_time = next_send_time(datetime.now(KST), self.send_at)
+        window_start, _ = self.crawler.yonhap_time_window(send_time)
+        next_poll = datetime.now(KST)
+        prepared = False
+        print(f"🕒 다음 발송: {send_time:%Y-%m-%d %H:%M} KST")
+
+        while not self._stop.is_set():
+            now = datetime.now(KST)
+            if now >= send_time:
+                self.send()
+                send_time = next_send_time(datetime.now(KST), self.send_at)
+                window_start, _ = self.crawler.yonhap_time_window(send_time)
+                prepared = False
+                print(f"🕒 다음 발송: {send_time:%Y-%m-%d %H:%M} KST")
+                continue
+
+            if not prepared and now >= send_time - self.PREPARE_BEFORE:
+                self.prepare(send_time)
+                prepared = True
+            elif self.poll_interval and window_start <= now and now >= next_poll:
+                self.poll(send_time)
+                next_poll = datetime.now(KST) + timedelta(seconds=self.poll_interval)
+
+            # 다음 일정까지 대기 (stop()이 불리면 바로 깨어남)
+            events = [send_time, send_time - self.PREPARE_BEFORE]
+            if self.poll_interval:
+                events.append(max(next_poll, window_start))
+            upcoming = [event for event in events if event > datetime.now(KST)]
+            wait = min(upcoming) - datetime.now(KST) if upcoming else timedelta(0)
+            self._stop.wait(min(max(wait.total_seconds(), 0.1), self.MAX_SLEEP))
+
+
+def serve(sequential=False, metrics_path='metrics.jsonl', deadline_seconds=600, http2=False,
+          yonhap_sections=('international',), send_at=(8, 30), poll_interval=900):
+    """데몬 모드 실행 함수 (종료 신호를 받을 때까지 크롤러를 유지)"""
+    print("=== 뉴스 크롤러 데몬 시작 ===")
+    if metrics_path:
+        metrics.open(metrics_path)
+
+    crawler = NewsCrawler(http2=http2, yonhap_sections=yonhap_sections)
+    email_sender = NewsEmailSender()
+    daemon = DigestDaemon(crawler, email_sender, send_at=send_at, poll_interval=poll_interval,
+                          sequential=sequential, deadline_seconds=deadline_seconds,
+                          archive=DigestArchive(ARCHIVE_PATH))
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+
+    try:
+        daemon.serve_forever()
+    finally:
+        print("\n=== 뉴스 크롤러 데몬 종료 ===")
+        crawler.close()
+        metrics.close()
@@ -0,0 +1,210 @@
+# digest_archive.py
+"""실행마다 크롤링 결과를 쌓아 두는 추가 전용 아카이브
+
+    .cache/archive/2026-10.jsonl.gz   # 월별 세그먼트 - 실행 하나가 gzip 멤버 하나 (기사 한 줄씩 JSON)
+    .cache/archive/index.jsonl        # 멤버별 위치/날짜/출처 색인 - 조회 시 필요한 멤버만 찾아 읽음
+"""
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+from datetime import datetime, timedelta, timezone
+
+from metrics import metrics
+
+KST = timezone(timedelta(hours=9))
+
+# 연합뉴스 기사의 출처 이름 (외신은 사이트 이름 그대로 사용)
+YONHAP_SOURCE = '연합뉴스'
+
+INDEX_FILE = 'index.jsonl'
+
+# 멤버를 읽을 때 한 번에 읽는 압축 바이트 수
+READ_CHUNK = 64 * 1024
+
+# 기록 중인 멤버는 이 크기까지만 메모리에 두고 넘으면 임시 파일로
+SPOOL_SIZE = 256 * 1024
+
+
+def _iter_member_lines(f, offset, length):
+    """세그먼트 파일의 gzip 멤버 하나를 조금씩 풀면서 한 줄씩 반환 (멤버 전체를 메모리에 올리지 않음)"""
+    f.seek(offset)
+    decompressor = zlib.decompressobj(wbits=31)
+    pending = b''
+    remaining = length
+    while remaining > 0:
+        chunk = f.read(min(READ_CHUNK, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        pending += decompressor.decompress(chunk)
+        *lines, pending = pending.split(b'\n')
+        yield from lines
+    pending += decompressor.flush()
+    if pending:
+        yield pending
+
+
+def _related_record(related):
+    """묶인 갱신판 기사 (발행 시각은 ISO 문자열로)"""
+    published = related['published']
+    return dict(related, published=published.isoformat() if published else None)
+
+
+class DigestArchive:
+    """실행별 외신 헤드라인/연합뉴스 기사를 압축 JSONL 세그먼트로 보관하고 날짜/출처로 조회"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self.index_path = os.path.join(path, INDEX_FILE)
+
+    def append(self, foreign_news, yonhap_articles, archived_at=None):
+        """실행 결과 하나를 현재 월 세그먼트 끝에 gzip 멤버로 추가하고 색인 항목 반환"""
+        records = self.record(foreign_news, yonhap_articles, archived_at)
+        while True:
+            try:
+                next(records)
+            except StopIteration as stop:
+                return stop.value
+
+    def record(self, foreign_news, yonhap_articles, archived_at=None):
+        """연합뉴스 기사를 그대로 넘겨주면서 한 줄씩 압축해 두는 생성기
+
+        기사가 다 지나가거나 중간에 멈추면 그때까지의 기록을 세그먼트 끝에 추가하고 색인에 기록함.
+        반환값(StopIteration.value)은 색인 항목 (저장 실패 시 None)
+        """
+        archived_at = archived_at or datetime.now(KST)
+        spool = tempfile.SpooledTemporaryFile(SPOOL_SIZE)
+        compressed = gzip.GzipFile(fileobj=spool, mode='wb')
+        summary = {'start': None, 'end': None, 'sources': set(), 'count': 0}
+
+        def write(record):
+            published = record['published']
+            summary['start'] = min(summary['start'] or published, published)
+            summary['end'] = max(summary['end'] or published, published)
+            summary['sources'].add(record['source'])
+            summary['count'] += 1
+            record['published'] = published.isoformat()
+            compressed.write((json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8'))
+
+        entry = None
+        try:
+            for site_name, news_data in foreign_news.items():
+                # 크롤링 실패한 사이트도 다이제스트 재현을 위해 제목 없이 기록
+                write({
+                    'source': site_name,
+                    'title': news_data['title'] if news_data else None,
+                    'link': news_data['link'] if news_data else None,
+                    'published': archived_at,
+                })
+            for article in yonhap_articles:
+                write({
+                    'source': YONHAP_SOURCE,
+                    'title': article['title'],
+                    'link': article['link'],
+                    'published': article['published'],
+                    'content': article.get('content'),
+                    'sections': article.get('sections'),
+                    'related': [_related_record(related) for related in article.get('related') or []] or None,
+                })
+                yield article
+        finally:
+            compressed.close()
+            try:
+                entry = self._commit(spool, archived_at, summary)
+                metrics.record('archive', items=summary['count'], bytes=entry['length'])
+            except Exception as e:
+                print(f"⚠️ 아카이브 저장 실패: {e}")
+            spool.close()
+        return entry
+
+    def _commit(self, spool, archived_at, summary):
+        """압축해 둔 멤버를 세그먼트 끝에 붙이고 색인에 기록"""
+        segment = f"{archived_at:%Y-%m}.jsonl.gz"
+        length = spool.tell()
+        spool.seek(0)
+        with self._lock:
+            # 세그먼트에 먼저 쓰고 색인은 나중에 기록 (중간에 죽으면 색인 없는 멤버는 무시됨)
+            with open(os.path.join(self.path, segment), 'ab') as f:
+                offset = f.tell()
+                shutil.copyfileobj(spool, f)
+            entry = {
+                'segment': segment,
+                'offset': offset,
+                'length': length,
+                'date': archived_at.date().isoformat(),
+                'archived_at': archived_at.isoformat(),
+                'start': (summary['start'] or archived_at).isoformat(),
+                'end': (summary['end'] or archived_at).isoformat(),
+                'sources': sorted(summary['sources']),
+                'count': summary['count'],
+            }
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        return entry
+
+    def entries(self):
+        """색인 항목을 기록 순서대로 반환 (실행당 한 줄이라 작음)"""
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _read_entry(self, entry):
+        """색인 항목이 가리키는 멤버의 기록을 차례로 반환"""
+        with open(os.path.join(self.path, entry['segment']), 'rb') as f:
+            for line in _iter_member_lines(f, entry['offset'], entry['length']):
+                if line:
+                    record = json.loads(line)
+                    record['published'] = datetime.fromisoformat(record['published'])
+                    for related in record.get('related') or []:
+                        if related['published']:
+                            related['published'] = datetime.fromisoformat(related['published'])
+                    record['digest_date'] = entry['date']
+                    yield record
+
+    def articles(self, start, end, sources=None):
+        """발행 시각이 start ~ end 인 기사를 기록 순서대로 하나씩 반환 (외신은 수집 시각 기준)
+
+        색인으로 범위/출처가 겹치는 멤버만 읽으므로 전체 기록을 메모리에 올리지 않음
+        """
+        sources = set(sources) if sources else None
+        for entry in self.entries():
+            if datetime.fromisoformat(entry['end']) < start or datetime.fromisoformat(entry['start']) > end:
+                continue
+            if sources and not sources.intersection(entry['sources']):
+                continue
+            for record in self._read_entry(entry):
+                if record['title'] is None or (sources and record['source'] not in sources):
+                    continue
+                if start <= record['published'] <= end:
+                    yield record
+
+    def digest(self, date):
+        """date(날짜 문자열 또는 date)에 보관된 마지막 실행을 (foreign_news, yonhap_articles)로 재구성"""
+        date = date if isinstance(date, str) else date.isoformat()
+        entries = [entry for entry in self.entries() if entry['date'] == date]
+        if not entries:
+            return None
+        foreign_news = {}
+        yonhap_articles = []
+        for record in self._read_entry(entries[-1]):
+            if record['source'] == YONHAP_SOURCE:
+                yonhap_articles.append({
+                    'title': record['title'],
+                    'link': record['link'],
+                    'published': record['published'],
+                    'content': record.get('content'),
+                    'sections': record.get('sections'),
+                    'related': record.get('related'),
+                })
+            elif record['title'] is None:
+                foreign_news[record['source']] = None
+            else:
+                foreign_news[record['source']] = {'title': record['title'], 'link': record['link']}
+        return foreign_news, yonhap_articles
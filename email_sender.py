@@ -1,39 +1,51 @@
 # email_sender.py
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.header import Header
 from datetime import datetime, timezone, timedelta
+from html import escape
+from string import Template
+import base64
 import os
+import shutil
+import tempfile
+import time
+import uuid
+
+from digest_archive import YONHAP_SOURCE
+from metrics import metrics
 
 KST = timezone(timedelta(hours=9))
 
-class NewsEmailSender:
-    def __init__(self):
-        self.smtp_server = "smtp.gmail.com"
-        self.smtp_port = 587
-        self.email = os.getenv('GMAIL_EMAIL')
-        self.password = os.getenv('GMAIL_PASSWORD')  # Gmail 앱 비밀번호
-        recipients_str = os.getenv('RECIPIENT_EMAIL', '')
-        self.recipients = [email.strip() for email in recipients_str.split(',') if email.strip()]
-    
-    def format_news_html(self, foreign_news, yonhap_articles):
-        """뉴스 데이터를 HTML 형식으로 포맷팅"""
-        html_content = f"""
+# SMTP로 바로 보낼 수 있도록 CRLF 줄바꿈으로 직렬화
+CRLF = '\r\n'
+
+# 렌더링/인코딩 중인 본문은 이 크기까지만 메모리에 두고 넘으면 임시 파일로
+SPOOL_SIZE = 256 * 1024
+# base64 한 줄(76자)이 원본 57바이트이므로 57의 배수 단위로 인코딩해야 줄이 이어짐
+BASE64_CHUNK = 57 * 1024
+# DATA 전송 시 한 번에 보내는 바이트 수
+SMTP_SEND_CHUNK = 64 * 1024
+
+# 섹션 태그가 없는 기사(기존 단일 섹션 크롤링)의 섹션 이름
+DEFAULT_SECTION_LABEL = '국제'
+
+# 다이제스트 템플릿 (모듈 로드 시 한 번만 컴파일, 값은 렌더링 시 이스케이프)
+HTML_HEAD = """
         <!DOCTYPE html>
         <html>
         <head>
             <meta charset="UTF-8">
             <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; margin: 20px; }}
-                .header {{ background-color: #2c3e50; color: white; padding: 20px; text-align: center; }}
-                .section {{ margin: 20px 0; }}
-                .foreign-news {{ background-color: #ecf0f1; padding: 15px; border-radius: 5px; }}
-                .yonhap-news {{ background-color: #e8f5e8; padding: 15px; border-radius: 5px; }}
-                .news-item {{ margin: 15px 0; padding: 10px; border-left: 4px solid #3498db; }}
-                .news-title {{ font-weight: bold; font-size: 16px; margin-bottom: 5px; }}
-                .news-link {{ color: #2980b9; text-decoration: none; }}
-                .news-content {{ margin-top: 10px; color: #555; }}
-                .timestamp {{ text-align: center; color: #7f8c8d; margin: 20px 0; }}
+                body { font-family: Arial, sans-serif; line-height: 1.6; margin: 20px; }
+                .header { background-color: #2c3e50; color: white; padding: 20px; text-align: center; }
+                .section { margin: 20px 0; }
+                .foreign-news { background-color: #ecf0f1; padding: 15px; border-radius: 5px; }
+                .yonhap-news { background-color: #e8f5e8; padding: 15px; border-radius: 5px; }
+                .news-item { margin: 15px 0; padding: 10px; border-left: 4px solid #3498db; }
+                .news-title { font-weight: bold; font-size: 16px; margin-bottom: 5px; }
+                .news-link { color: #2980b9; text-decoration: none; }
+                .news-content { margin-top: 10px; color: #555; }
+                .timestamp { text-align: center; color: #7f8c8d; margin: 20px 0; }
             </style>
         </head>
         <body>
@@ -45,65 +57,72 @@ class NewsEmailSender:
                 <h2>외신 헤드라인</h2>
                 <div class="foreign-news">
         """
-        
-        # 외신 뉴스 추가
-        for site_name, news_data in foreign_news.items():
-            if news_data:
-                html_content += f"""
+
+HTML_FOREIGN_ITEM = Template("""
                     <div class="news-item">
-                        <h3 class="news-title">{site_name}</h3>
-                        <a href="{news_data['link']}" class="news-link" target="_blank">
-                            {news_data['title']}
+                        <h3 class="news-title">$site_name</h3>
+                        <a href="$link" class="news-link" target="_blank">
+                            $title
                         </a>
                     </div>
-                """
-            else:
-                html_content += f"""
+                """)
+
+HTML_FOREIGN_FAILED = Template("""
                     <div class="news-item">
-                        <h3 class="news-title">{site_name}</h3>
+                        <h3 class="news-title">$site_name</h3>
                         <p style="color: #e74c3c;">크롤링 실패</p>
                     </div>
-                """
-        
-        html_content += """
+                """)
+
+HTML_YONHAP_START = Template("""
                 </div>
             </div>
             
             <div class="section">
-                <h2>연합뉴스 국제</h2>
+                <h2>연합뉴스 $label</h2>
                 <div class="yonhap-news">
-        """
-        
-        # 연합뉴스 기사 추가
-        if yonhap_articles:
-            for i, article in enumerate(yonhap_articles, 1):
-                published_time = article['published'].strftime('%m-%d %H:%M')
-                html_content += f"""
+        """)
+
+HTML_YONHAP_ITEM = Template("""
                     <div class="news-item">
-                        <h3 class="news-title">{i}. {article['title']}</h3>
-                        <p style="color: #7f8c8d; font-size: 12px;">발행시간: {published_time}</p>
-                        <a href="{article['link']}" class="news-link" target="_blank">기사 보기</a>
-                """
-                
-                # 본문 내용이 있으면 추가
-                if article.get('content'):
-                    html_content += f"""
+                        <h3 class="news-title">$index. $title</h3>
+                        <p style="color: #7f8c8d; font-size: 12px;">발행시간: $published</p>
+                        <a href="$link" class="news-link" target="_blank">기사 보기</a>
+                """)
+
+HTML_YONHAP_TAGS = Template("""
+                        <p style="color: #7f8c8d; font-size: 12px;">함께 실린 섹션: $tags</p>
+                """)
+
+HTML_YONHAP_CONTENT = Template("""
                         <div class="news-content">
-                            <p style="margin: 8px 0; color: #555; line-height: 1.5;">{article['content']}</p>
+                            <p style="margin: 8px 0; color: #555; line-height: 1.5;">$content</p>
                         </div>
-                    """
-                
-                html_content += """
+                    """)
+
+HTML_YONHAP_RELATED_START = """
+                        <ul style="margin: 8px 0; padding-left: 20px; font-size: 13px; color: #7f8c8d;">
+                """
+
+HTML_YONHAP_RELATED_ITEM = Template("""
+                            <li>$published <a href="$link" class="news-link" target="_blank">$title</a></li>
+                """)
+
+HTML_YONHAP_RELATED_END = """
+                        </ul>
+                """
+
+HTML_YONHAP_ITEM_END = """
                     </div>
                 """
-        else:
-            html_content += """
+
+HTML_YONHAP_EMPTY = """
                 <div class="news-item">
                     <p style="color: #e74c3c;">연합뉴스 기사를 가져올 수 없습니다.</p>
                 </div>
             """
-        
-        html_content += """
+
+HTML_TAIL = """
                 </div>
             </div>
             
@@ -113,48 +132,357 @@ class NewsEmailSender:
         </body>
         </html>
         """
+
+
+def _spool():
+    return tempfile.SpooledTemporaryFile(SPOOL_SIZE, mode='w+', encoding='utf-8')
+
+
+def _write_base64(out, body_file):
+    """텍스트 파일을 UTF-8 base64로 조금씩 인코딩해 out에 씀 (76자 줄, CRLF)"""
+    pending = b''
+    while True:
+        chunk = body_file.read(BASE64_CHUNK)
+        if chunk:
+            pending += chunk.encode('utf-8')
+        # 마지막 조각 외에는 57바이트 배수만 인코딩하고 나머지는 다음 조각과 이어 붙임
+        size = len(pending) if not chunk else len(pending) - len(pending) % 57
+        if size:
+            out.write(base64.encodebytes(pending[:size]).replace(b'\n', b'\r\n'))
+            pending = pending[size:]
+        if not chunk:
+            return
+
+
+class DigestWriter:
+    """다이제스트 HTML/텍스트 본문을 기사가 올 때마다 임시 파일에 이어 쓰는 렌더러
+
+    기사는 첫 번째 섹션별 임시 파일에 쓰고 finish()에서 섹션 순서대로 이어 붙임
+    (본문 전체를 문자열로 만들지 않으므로 기사 수와 관계없이 메모리 사용량이 일정함)
+    """
+
+    def __init__(self, foreign_news):
+        self.count = 0
+        self.html = _spool()
+        self.text = _spool()
+        # 섹션 이름 -> [HTML 파일, 텍스트 파일, 섹션 안 번호]
+        self.sections = {}
+        
+        self.html.write(HTML_HEAD)
+        self.text.write("일간 뉴스 브리핑\n\n[외신 헤드라인]")
+        
+        # 외신 뉴스 추가
+        for site_name, news_data in foreign_news.items():
+            if news_data:
+                self.html.write(HTML_FOREIGN_ITEM.substitute(
+                    site_name=escape(site_name),
+                    link=escape(news_data['link']),
+                    title=escape(news_data['title']),
+                ))
+                self.text.write(f"\n- {site_name}: {news_data['title']}\n  {news_data['link']}")
+            else:
+                self.html.write(HTML_FOREIGN_FAILED.substitute(site_name=escape(site_name)))
+                self.text.write(f"\n- {site_name}: 크롤링 실패")
+    
+    def _section(self, label):
+        section = self.sections.get(label)
+        if section is None:
+            section = self.sections[label] = [_spool(), _spool(), 0]
+            section[0].write(HTML_YONHAP_START.substitute(label=escape(label)))
+            section[1].write(f"\n\n[연합뉴스 {label}]")
+        return section
+    
+    def add(self, article):
+        """연합뉴스 기사 하나를 첫 번째 섹션 묶음에 추가 (섹션 간 중복 기사는 한 번만 표시)"""
+        section = self._section((article.get('sections') or [DEFAULT_SECTION_LABEL])[0])
+        html, text = section[0], section[1]
+        section[2] += 1
+        self.count += 1
+        
+        published_time = article['published'].strftime('%m-%d %H:%M')
+        html.write(HTML_YONHAP_ITEM.substitute(
+            index=section[2],
+            title=escape(article['title']),
+            published=published_time,
+            link=escape(article['link']),
+        ))
+        text.write(f"\n\n{section[2]}. {article['title']} ({published_time})\n   {article['link']}")
+        
+        # 다른 섹션에도 실린 기사면 섹션 표시
+        other_sections = (article.get('sections') or [])[1:]
+        if other_sections:
+            tags = ', '.join(other_sections)
+            html.write(HTML_YONHAP_TAGS.substitute(tags=escape(tags)))
+            text.write(f"\n   함께 실린 섹션: {tags}")
+        
+        # 본문 내용이 있으면 추가
+        if article.get('content'):
+            html.write(HTML_YONHAP_CONTENT.substitute(content=escape(article['content'])))
+            text.write(f"\n   {article['content']}")
+        
+        # 같은 기사의 이전 속보/갱신판은 링크만 표시
+        if article.get('related'):
+            html.write(HTML_YONHAP_RELATED_START)
+            text.write("\n   관련 기사:")
+            for related in article['related']:
+                related_time = related['published'].strftime('%m-%d %H:%M') if related['published'] else ''
+                html.write(HTML_YONHAP_RELATED_ITEM.substitute(
+                    published=related_time,
+                    title=escape(related['title']),
+                    link=escape(related['link']),
+                ))
+                text.write(f"\n   - {related['title']} ({related_time}) {related['link']}")
+            html.write(HTML_YONHAP_RELATED_END)
+        
+        html.write(HTML_YONHAP_ITEM_END)
+    
+    def finish(self):
+        """섹션들을 이어 붙이고 맺음말을 써서 처음으로 되감은 (HTML 파일, 텍스트 파일) 반환"""
+        if not self.sections:
+            html, text = self._section(DEFAULT_SECTION_LABEL)[:2]
+            html.write(HTML_YONHAP_EMPTY)
+            text.write("\n연합뉴스 기사를 가져올 수 없습니다.")
+        
+        for html, text, _ in self.sections.values():
+            for source, target in ((html, self.html), (text, self.text)):
+                source.seek(0)
+                shutil.copyfileobj(source, target)
+                source.close()
+        self.sections = {}
+        
+        self.html.write(HTML_TAIL)
+        self.text.write("\n\n자동 생성된 뉴스 브리핑입니다.")
+        self.html.seek(0)
+        self.text.seek(0)
+        return self.html, self.text
+    
+    def close(self):
+        for html, text, _ in self.sections.values():
+            html.close()
+            text.close()
+        self.sections = {}
+        self.html.close()
+        self.text.close()
+
+
+class NewsEmailSender:
+    def __init__(self, smtp_server=None, smtp_port=None, use_starttls=None, timeout=30):
+        # 테스트 시 로컬 SMTP 서버(aiosmtpd 등)로 바꿀 수 있음
+        self.smtp_server = smtp_server or os.getenv('SMTP_SERVER', "smtp.gmail.com")
+        self.smtp_port = int(smtp_port or os.getenv('SMTP_PORT', 587))
+        if use_starttls is None:
+            use_starttls = os.getenv('SMTP_STARTTLS', '1') != '0'
+        self.use_starttls = use_starttls
+        self.timeout = timeout
+        self.email = os.getenv('GMAIL_EMAIL')
+        self.password = os.getenv('GMAIL_PASSWORD')  # Gmail 앱 비밀번호
+        recipients_str = os.getenv('RECIPIENT_EMAIL', '')
+        self.recipients = [email.strip() for email in recipients_str.split(',') if email.strip()]
+    
+    def render_digest(self, foreign_news, yonhap_articles):
+        """뉴스 데이터를 HTML 본문과 텍스트 본문 문자열로 렌더링 (제목/요약/링크 이스케이프)"""
+        writer = DigestWriter(foreign_news)
+        try:
+            for article in yonhap_articles:
+                writer.add(article)
+            html_file, text_file = writer.finish()
+            return html_file.read(), text_file.read()
+        finally:
+            writer.close()
+    
+    def digest_from_archive(self, archive, start_date, end_date=None):
+        """아카이브에서 다이제스트 데이터 재구성 (end_date가 없으면 start_date 발송분 그대로, 있으면 기간 모음)"""
+        if end_date is None:
+            digest = archive.digest(start_date)
+            if digest is None:
+                raise ValueError(f"아카이브에 {start_date} 기록이 없음")
+            return digest
         
+        start = datetime.combine(start_date, datetime.min.time(), KST)
+        end = datetime.combine(end_date, datetime.max.time(), KST)
+        foreign_news = {}
+        yonhap_articles = {}
+        for record in archive.articles(start, end):
+            if record['source'] == YONHAP_SOURCE:
+                # 여러 실행에 걸쳐 보관된 같은 기사는 한 번만
+                yonhap_articles.setdefault(record['link'], record)
+            else:
+                foreign_news[f"{record['source']} ({record['digest_date'][5:]})"] = record
+        return foreign_news, list(yonhap_articles.values())
+    
+    def render_from_archive(self, archive, start_date, end_date=None):
+        """아카이브에 보관된 기록으로 다이제스트 렌더링 (크롤링 없이 재발송/주간 모음용)"""
+        return self.render_digest(*self.digest_from_archive(archive, start_date, end_date))
+    
+    def format_news_html(self, foreign_news, yonhap_articles):
+        """뉴스 데이터를 HTML 형식으로 포맷팅"""
+        html_content, _ = self.render_digest(foreign_news, yonhap_articles)
         return html_content
     
-    def send_email(self, foreign_news, yonhap_articles):
-        """이메일 발송 (BCC로 개별 발송 - 수신자끼리 서로 모름)"""
+    def write_message(self, out, html_file, text_file, subject=None):
+        """텍스트/HTML 본문 파일을 multipart/alternative 메시지로 out에 조금씩 인코딩 (To 헤더 제외, CRLF)"""
+        subject = subject or f"일간 뉴스 브리핑 - {datetime.now(KST).strftime('%Y.%m.%d')}"
+        boundary = f"==============={uuid.uuid4().hex}=="
+        headers = [
+            f'Content-Type: multipart/alternative;{CRLF} boundary="{boundary}"',
+            'MIME-Version: 1.0',
+            f"Subject: {Header(subject, 'utf-8', header_name='Subject').encode(linesep=CRLF)}",
+        ]
+        if self.email:
+            headers.append(f"From: {self.email}")
+        out.write((CRLF.join(headers) + CRLF + CRLF).encode('ascii'))
+        for subtype, body_file in (('plain', text_file), ('html', html_file)):
+            out.write((
+                f"--{boundary}{CRLF}"
+                f'Content-Type: text/{subtype}; charset="utf-8"{CRLF}'
+                f"MIME-Version: 1.0{CRLF}"
+                f"Content-Transfer-Encoding: base64{CRLF}{CRLF}"
+            ).encode('ascii'))
+            _write_base64(out, body_file)
+        out.write(f"--{boundary}--{CRLF}".encode('ascii'))
+    
+    def _connect(self):
+        """SMTP 서버 연결 및 로그인"""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        if self.use_starttls:
+            server.starttls()
+        if self.password:
+            server.login(self.email, self.password)
+        return server
+    
+    def _close(self, server):
+        """SMTP 연결 종료 (이미 끊긴 연결이면 무시)"""
+        if server is None:
+            return
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+    
+    def _send_message(self, server, recipient, message_file):
+        """To 헤더를 붙인 메시지를 DATA 명령으로 조금씩 전송 (smtplib.sendmail과 달리 메시지 전체를 메모리에 올리지 않음)"""
+        server.ehlo_or_helo_if_needed()
+        try:
+            code, response = server.mail(self.email)
+            if code != 250:
+                raise smtplib.SMTPSenderRefused(code, response, self.email)
+            code, response = server.rcpt(recipient)
+            if code not in (250, 251):
+                raise smtplib.SMTPRecipientsRefused({recipient: (code, response)})
+            server.putcmd('data')
+            code, response = server.getreply()
+            if code != 354:
+                raise smtplib.SMTPDataError(code, response)
+        except smtplib.SMTPServerDisconnected:
+            raise
+        except smtplib.SMTPException:
+            # 거부된 수신자 등으로 트랜잭션이 열린 채 남으면 다음 수신자의 MAIL이 503으로 실패하므로 초기화
+            self._rset(server)
+            raise
+        
+        sent = 0
+        batch = [f"To: {recipient}\r\n".encode('utf-8')]
+        batch_size = len(batch[0])
+        message_file.seek(0)
+        for line in message_file:
+            # 점으로 시작하는 줄은 점을 하나 더 붙임 (RFC 5321 투명성)
+            if line.startswith(b'.'):
+                line = b'.' + line
+            batch.append(line)
+            batch_size += len(line)
+            if batch_size >= SMTP_SEND_CHUNK:
+                server.send(b''.join(batch))
+                sent += batch_size
+                batch, batch_size = [], 0
+        batch.append(b'.\r\n')
+        server.send(b''.join(batch))
+        sent += batch_size
+        
+        code, response = server.getreply()
+        if code != 250:
+            self._rset(server)
+            raise smtplib.SMTPDataError(code, response)
+        return sent
+    
+    def _rset(self, server):
+        """SMTP 트랜잭션 초기화 (연결이 이미 끊겼으면 무시 - 다음 발송에서 재연결)"""
+        try:
+            server.rset()
+        except smtplib.SMTPServerDisconnected:
+            pass
+    
+    def send_email(self, foreign_news, yonhap_articles, subject=None):
+        """이메일 발송 (BCC로 개별 발송 - 수신자끼리 서로 모름)
+
+        yonhap_articles는 생성기여도 됨 - 기사가 오는 대로 본문에 이어 쓰고 SMTP 연결은 렌더링이 끝난 뒤 엶
+        """
         try:
             if not self.recipients:
                 print("❌ 수신자가 설정되지 않음")
                 return False
             
-            # HTML 콘텐츠 생성
-            html_content = self.format_news_html(foreign_news, yonhap_articles)
-            
-            success_count = 0
-            
-            # 각 수신자별로 개별 발송
-            for recipient in self.recipients:
+            # HTML/텍스트 본문을 기사 하나씩 임시 파일에 렌더링하고 MIME 인코딩도 한 번만 수행
+            writer = DigestWriter(foreign_news)
+            message_file = tempfile.SpooledTemporaryFile(SPOOL_SIZE)
+            try:
+                # 기사를 받아 오는 시간(본문 요청 등 - summaries 지표)은 빼고 렌더링/인코딩 시간만 잼
+                render = {'items': 0}
+                elapsed = 0.0
                 try:
-                    # 개별 메시지 생성
-                    msg = MIMEMultipart('alternative')
-                    msg['Subject'] = f"일간 뉴스 브리핑 - {datetime.now(KST).strftime('%Y.%m.%d')}"
-                    msg['From'] = self.email
-                    msg['To'] = recipient
-                    
-                    html_part = MIMEText(html_content, 'html', 'utf-8')
-                    msg.attach(html_part)
-                    
-                    # SMTP 서버 연결 및 발송
-                    with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                        server.starttls()
-                        server.login(self.email, self.password)
-                        server.send_message(msg)
-                    
-                    print(f"✅ {recipient} 발송 성공")
-                    success_count += 1
-                    
+                    for article in yonhap_articles:
+                        start = time.perf_counter()
+                        writer.add(article)
+                        elapsed += time.perf_counter() - start
+                    start = time.perf_counter()
+                    html_file, text_file = writer.finish()
+                    self.write_message(message_file, html_file, text_file, subject)
+                    elapsed += time.perf_counter() - start
+                    render['bytes'] = message_file.tell()
                 except Exception as e:
-                    print(f"❌ {recipient} 발송 실패: {e}")
+                    render['error'] = f"{type(e).__name__}: {e}"
+                    raise
+                finally:
+                    render['items'] = writer.count
+                    render['duration_ms'] = round(elapsed * 1000, 2)
+                    metrics.record('render', **render)
+                writer.close()
+                
+                success_count = 0
+                server = None
+                
+                try:
+                    # SMTP 연결은 한 번만 열어 모든 수신자에게 재사용
+                    with metrics.span('smtp_connect'):
+                        server = self._connect()
+                    
+                    # 각 수신자별로 개별 발송 (수신자별로는 To 헤더만 붙임)
+                    for recipient in self.recipients:
+                        try:
+                            with metrics.span('smtp_send') as span:
+                                try:
+                                    span['bytes'] = self._send_message(server, recipient, message_file)
+                                except (smtplib.SMTPServerDisconnected, ConnectionError):
+                                    # 서버가 세션을 끊었으면 다시 연결해서 한 번 더 시도
+                                    print("🔄 SMTP 연결 끊김 - 재연결")
+                                    span['retries'] = 1
+                                    self._close(server)
+                                    server = self._connect()
+                                    span['bytes'] = self._send_message(server, recipient, message_file)
+                            
+                            print(f"✅ {recipient} 발송 성공")
+                            success_count += 1
+                            
+                        except Exception as e:
+                            print(f"❌ {recipient} 발송 실패: {e}")
+                finally:
+                    self._close(server)
+            finally:
+                writer.close()
+                message_file.close()
             
             print(f"총 {success_count}/{len(self.recipients)}명 발송 완료")
             return success_count > 0
             
         except Exception as e:
             print(f"❌ 이메일 발송 실패: {e}")
-            return False
\ No newline at end of file
+            return False
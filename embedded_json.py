@@ -0,0 +1,121 @@
+# embedded_json.py
+"""페이지에 들어 있는 헤드라인 JSON(__NEXT_DATA__, window.__preloadedData, JSON-LD)만 찾아 읽기
+
+HTML 전체를 파싱하지 않고 바이트에서 표시 문자열을 찾아 그 script 블록만 디코딩함
+"""
+import json
+import re
+from urllib.parse import urljoin
+
+SCRIPT_END = b'</script>'
+
+# 기사 URL에는 연도 경로가 들어 있음 (/2025/09/07/... , /politics/2025/09/07/...) - 메뉴/섹션 링크 제외용
+ARTICLE_PATH = re.compile(r'/20\d\d/')
+
+# 제목이 들어 있는 키와 링크가 들어 있는 키 (Arc XP ANS, NYT GraphQL, schema.org 순으로 자주 쓰임)
+HEADLINE_KEYS = ('headlines', 'headline', 'promotionalHeadline', 'name')
+HEADLINE_TEXT_KEYS = ('basic', 'default', 'main')
+LINK_KEYS = ('canonical_url', 'website_url', 'url', 'link')
+
+# NYT 데이터는 JSON이 아니라 JS 객체라 undefined가 섞여 있을 수 있음
+JS_UNDEFINED = re.compile(r'(?<=[:,\[])undefined(?=[,}\]])')
+
+
+def decode_script(block):
+    """marker 뒤 script 블록에서 첫 JSON 값 디코딩 (실패하면 None)"""
+    text = block.decode('utf-8', 'replace')
+    starts = [index for index in (text.find('{'), text.find('[')) if index >= 0]
+    if not starts:
+        return None
+    decoder = json.JSONDecoder()
+    start = min(starts)
+    try:
+        return decoder.raw_decode(text, start)[0]
+    except ValueError:
+        pass
+    try:
+        return decoder.raw_decode(JS_UNDEFINED.sub('null', text), start)[0]
+    except ValueError:
+        return None
+
+
+def scan_embedded_json(chunks, marker, buffer, byte_budget=None, stop_at=None):
+    """청크를 buffer에 쌓으면서 marker가 있는 script 블록의 JSON만 하나씩 디코딩해 반환
+
+    stop_at(예: b'</head>')이 나오면 더 읽지 않음. buffer에는 읽은 바이트가 모두 남으므로
+    찾지 못하면 호출한 쪽에서 DOM 파싱으로 넘길 수 있음
+    """
+    search_from = 0
+    block_start = None
+    stop_from = 0
+    for chunk in chunks:
+        buffer.extend(chunk)
+        while True:
+            if block_start is None:
+                found = buffer.find(marker, search_from)
+                if found < 0:
+                    # 청크 경계에 걸친 marker를 놓치지 않도록 끝부분은 다시 검사
+                    search_from = max(search_from, len(buffer) - len(marker) + 1)
+                    break
+                block_start = found + len(marker)
+                search_from = block_start
+            end = buffer.find(SCRIPT_END, search_from)
+            if end < 0:
+                search_from = max(block_start, len(buffer) - len(SCRIPT_END) + 1)
+                break
+            data = decode_script(bytes(buffer[block_start:end]))
+            block_start = None
+            search_from = end + len(SCRIPT_END)
+            if data is not None:
+                yield data
+        if stop_at and block_start is None:
+            if buffer.find(stop_at, stop_from) >= 0:
+                return
+            stop_from = max(0, len(buffer) - len(stop_at) + 1)
+        if byte_budget and len(buffer) >= byte_budget:
+            return
+
+
+def _headline_text(node):
+    for key in HEADLINE_KEYS:
+        value = node.get(key)
+        if isinstance(value, dict):
+            value = next((value[text_key] for text_key in HEADLINE_TEXT_KEYS
+                          if isinstance(value.get(text_key), str)), None)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return None
+
+
+def _link(node):
+    for key in LINK_KEYS:
+        value = node.get(key)
+        if isinstance(value, str) and value:
+            return value
+    # schema.org ListItem은 링크가 item 안에 있을 수 있음
+    item = node.get('item')
+    if isinstance(item, dict):
+        return _link(item)
+    return None
+
+
+def find_headline(data, base_url):
+    """디코딩한 JSON을 문서 순서대로 훑어 처음 나오는 (제목, 기사 링크) 쌍 반환 (없으면 None)"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            title = _headline_text(node)
+            link = _link(node)
+            if title and link:
+                link = urljoin(base_url, link)
+                if ARTICLE_PATH.search(link):
+                    return {'title': title, 'link': link}
+            children = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            continue
+        # 스택이므로 뒤에서부터 넣어야 앞쪽 항목을 먼저 봄
+        stack.extend(child for child in reversed(list(children)) if isinstance(child, (dict, list)))
+    return None
@@ -0,0 +1,146 @@
+# html_parser.py
+from functools import lru_cache
+
+from metrics import metrics
+
+# bs4/soupsieve/lxml은 파서를 처음 만들거나 쓸 때 가져옴 (이메일 렌더링만 할 때는 필요 없음)
+
+# 'lxml' / 'html.parser'는 BeautifulSoup, 'selectolax'는 selectolax(선택 설치) 사용
+BACKENDS = ('lxml', 'html.parser', 'selectolax')
+
+
+@lru_cache(maxsize=None)
+def compile_selector(selector):
+    """CSS 선택자를 한 번만 컴파일해서 재사용"""
+    import soupsieve
+
+    return soupsieve.compile(selector)
+
+
+class SoupNode:
+    """BeautifulSoup 요소 래퍼"""
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    def select_one(self, selector):
+        found = compile_selector(selector).select_one(self.tag)
+        return SoupNode(found) if found is not None else None
+
+    def select(self, selector):
+        return [SoupNode(tag) for tag in compile_selector(selector).select(self.tag)]
+
+    def text(self):
+        return self.tag.get_text(strip=True)
+
+    def attr(self, name, default=''):
+        return self.tag.get(name, default)
+
+    def find_parent(self, name):
+        parent = self.tag.find_parent(name)
+        return SoupNode(parent) if parent is not None else None
+
+
+class SelectolaxNode:
+    """selectolax 요소 래퍼 (SoupNode와 같은 인터페이스)"""
+
+    def __init__(self, node):
+        self.node = node
+
+    def select_one(self, selector):
+        found = self.node.css_first(selector)
+        return SelectolaxNode(found) if found is not None else None
+
+    def select(self, selector):
+        return [SelectolaxNode(node) for node in self.node.css(selector)]
+
+    def text(self):
+        return self.node.text(deep=True, separator='', strip=True)
+
+    def attr(self, name, default=''):
+        return self.node.attributes.get(name) or default
+
+    def find_parent(self, name):
+        parent = self.node.parent
+        while parent is not None:
+            if parent.tag == name:
+                return SelectolaxNode(parent)
+            parent = parent.parent
+        return None
+
+
+class HtmlParser:
+    """사이트별 HTML 파서 (백엔드 선택, 필요한 영역만 파싱, 선택자 미리 컴파일)"""
+
+    def __init__(self, backend='lxml', scope=None, selectors=(), name=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"지원하지 않는 파서 백엔드: {backend}")
+        self.backend = backend
+        # 지표 기록용 이름 (예: 'bbc', 'yonhap_article')
+        self.name = name
+        # scope: SoupStrainer 인자 (예: {'id': 'main-content'}) - 해당 영역만 트리로 만듦
+        self.strainer = None
+        if scope and backend != 'selectolax':
+            from bs4 import SoupStrainer
+            self.strainer = SoupStrainer(**scope)
+
+        if backend == 'selectolax':
+            # selectolax는 선택자를 엔진 내부에서 처리하므로 미리 컴파일할 필요 없음
+            from selectolax.parser import HTMLParser as SelectolaxHTMLParser
+            self._selectolax = SelectolaxHTMLParser
+        else:
+            for selector in selectors:
+                compile_selector(selector)
+
+    def parse(self, content):
+        """HTML 바이트/문자열을 파싱해 select_one/select를 지원하는 루트 노드 반환"""
+        with metrics.span('parse', site=self.name, bytes=len(content)):
+            if self.backend == 'selectolax':
+                # selectolax는 전체 문서를 파싱하지만 BeautifulSoup보다 훨씬 빠름
+                return SelectolaxNode(self._selectolax(content))
+            from bs4 import BeautifulSoup
+            return SoupNode(BeautifulSoup(content, self.backend, parse_only=self.strainer))
+
+
+def _marker_closed(events, marker):
+    """닫힌 요소 중 marker(태그, 클래스)에 맞는 것이 있는지 확인"""
+    tag, class_token = marker
+    for _, element in events:
+        if tag and element.tag != tag:
+            continue
+        if class_token and class_token not in (element.get('class') or '').split():
+            continue
+        return True
+    return False
+
+
+def parse_until(chunks, parser, extract, marker, byte_budget=None, buffer=None):
+    """청크를 점진적으로 파싱하다 marker 요소가 닫힌 뒤 extract가 성공하면 바로 중단
+
+    반환값: (extract 결과, 읽은 바이트 수, 조기 중단 여부)
+    buffer를 넘기면 읽은 바이트가 남으므로 추출에 실패해도 호출한 쪽에서 다른 방법으로 이어갈 수 있음
+    """
+    from lxml import etree
+
+    pull_parser = etree.HTMLPullParser(events=('end',))
+    buffer = bytearray() if buffer is None else buffer
+
+    for chunk in chunks:
+        buffer.extend(chunk)
+        pull_parser.feed(chunk)
+
+        # marker가 닫혔을 때만 받은 부분까지 파싱해서 추출 시도 (청크당 최대 1회)
+        if _marker_closed(pull_parser.read_events(), marker):
+            try:
+                result = extract(parser.parse(bytes(buffer)))
+            except Exception:
+                result = None
+            if result is not None:
+                return result, len(buffer), True
+
+        if byte_budget and len(buffer) >= byte_budget:
+            print(f"⚠️ 바이트 한도({byte_budget:,}B) 도달 - 받은 부분까지만 파싱")
+            break
+
+    # 끝까지 받았거나 한도에 도달하면 받은 전체로 추출 (실패 시 예외 전달)
+    return extract(parser.parse(bytes(buffer))), len(buffer), False
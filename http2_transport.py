@@ -0,0 +1,95 @@
+# http2_transport.py
+import requests
+
+try:
+    import brotli  # noqa: F401  (설치돼 있으면 httpx가 br 응답을 풀어줌)
+    ACCEPT_ENCODING = 'br, gzip, deflate'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+
+class _RawCounter:
+    """requests의 response.raw.tell()처럼 전송된 바이트 수를 알려줌"""
+
+    def __init__(self, response):
+        self._response = response
+
+    def tell(self):
+        return self._response.num_bytes_downloaded
+
+
+class Http2Response:
+    """httpx 응답을 크롤러가 쓰는 requests.Response 인터페이스로 감싼 것"""
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = str(response.url)
+        self.raw = _RawCounter(response)
+        self.from_cache = False
+
+    @property
+    def content(self):
+        return self._response.read()
+
+    @property
+    def text(self):
+        self._response.read()
+        return self._response.text
+
+    def iter_content(self, chunk_size=None):
+        return self._response.iter_bytes(chunk_size)
+
+    def raise_for_status(self):
+        """requests와 같은 예외(requests.HTTPError)를 던짐"""
+        if 400 <= self.status_code < 600:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+    def close(self):
+        self._response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Http2Session:
+    """requests.Session 대신 쓸 수 있는 httpx 기반 HTTP/2 세션 (같은 호스트 요청을 연결 하나로 다중화)
+
+    httpx[http2]가 필요함: pip install "httpx[http2]" (brotli 설치 시 br 압축도 사용)
+    """
+
+    def __init__(self, http1=True, max_connections=20):
+        import httpx
+
+        self._httpx = httpx
+        # http1=False면 TLS 협상 없이 처음부터 HTTP/2로 연결 (로컬 h2c 서버 테스트용)
+        self.client = httpx.Client(
+            http1=http1,
+            http2=True,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections),
+            headers={'Accept-Encoding': ACCEPT_ENCODING},
+        )
+        self.headers = self.client.headers
+
+    def get(self, url, timeout=None, stream=False, headers=None, **kwargs):
+        """requests.Session.get과 같은 방식으로 호출 (연결/타임아웃 오류도 requests 예외로 변환)"""
+        httpx = self._httpx
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        try:
+            request = self.client.build_request('GET', url, headers=headers, timeout=timeout)
+            response = self.client.send(request, stream=stream)
+        except httpx.TimeoutException as e:
+            raise requests.Timeout(str(e)) from e
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(str(e)) from e
+        return Http2Response(response)
+
+    def close(self):
+        self.client.close()
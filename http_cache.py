@@ -0,0 +1,194 @@
+# http_cache.py
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# URL 패턴별 캐시 유효 시간 (초). 유효 시간이 지나면 조건부 GET으로 재검증
+DEFAULT_TTLS = [
+    # 연합뉴스 기사 본문은 게시 후 바뀌지 않음
+    (r'^https://www\.yna\.co\.kr/view/', 30 * 24 * 3600),
+]
+
+# 캐시에 보관할 응답 헤더
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+MISSING = object()
+
+
+class HttpCache:
+    """SQLite 기반 디스크 HTTP 캐시 (크기 기준 LRU 삭제, URL 패턴별 TTL)"""
+
+    def __init__(self, path, max_bytes=200 * 1024 * 1024, ttls=None, default_ttl=0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in (DEFAULT_TTLS if ttls is None else ttls)]
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                derived TEXT NOT NULL DEFAULT '{}'
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)")
+        self._conn.commit()
+
+    def ttl_for(self, url):
+        """URL에 해당하는 캐시 유효 시간 (초)"""
+        for pattern, ttl in self.ttls:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def lookup(self, url):
+        """캐시 항목 조회 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT headers, body, stored_at FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+        headers, body, stored_at = row
+        return {
+            'headers': json.loads(headers),
+            'body': body,
+            'stored_at': stored_at,
+        }
+
+    def is_fresh(self, url, entry):
+        """TTL 안이면 네트워크 요청 없이 사용 가능"""
+        return time.time() - entry['stored_at'] < self.ttl_for(url)
+
+    def store(self, url, response):
+        """200 응답 저장 (본문이 바뀌었으므로 파생 데이터는 초기화)"""
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        body = response.content
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (url, headers, body, size, stored_at, accessed_at, derived) "
+                "VALUES (?, ?, ?, ?, ?, ?, '{}')",
+                (url, json.dumps(headers), body, len(body), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, url, response):
+        """304 응답으로 재검증된 항목의 저장 시각과 검증 헤더 갱신"""
+        with self._lock:
+            row = self._conn.execute("SELECT headers FROM entries WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return
+            headers = json.loads(row[0])
+            for name in ('ETag', 'Last-Modified'):
+                if name in response.headers:
+                    headers[name] = response.headers[name]
+            now = time.time()
+            self._conn.execute(
+                "UPDATE entries SET headers = ?, stored_at = ?, accessed_at = ? WHERE url = ?",
+                (json.dumps(headers), now, now, url),
+            )
+            self._conn.commit()
+
+    def get_derived(self, url, name, default=MISSING):
+        """본문에서 추출해 둔 값 조회 (304/캐시 적중 시 파싱 생략용)"""
+        with self._lock:
+            row = self._conn.execute("SELECT derived FROM entries WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return default
+        return json.loads(row[0]).get(name, default)
+
+    def set_derived(self, url, name, value):
+        """본문에서 추출한 값 저장 (JSON 직렬화 가능한 값만)"""
+        with self._lock:
+            row = self._conn.execute("SELECT derived FROM entries WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return
+            derived = json.loads(row[0])
+            derived[name] = value
+            self._conn.execute("UPDATE entries SET derived = ? WHERE url = ?", (json.dumps(derived), url))
+            self._conn.commit()
+
+    def _evict(self):
+        """전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (락 안에서 호출)"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self._conn.execute(
+            "SELECT url, size FROM entries ORDER BY accessed_at ASC"
+        ).fetchall():
+            self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedSession(requests.Session):
+    """GET 요청을 디스크 캐시로 처리하는 Session (If-None-Match / If-Modified-Since 재검증)"""
+
+    def __init__(self, cache):
+        super().__init__()
+        self.cache = cache
+
+    def request(self, method, url, *args, **kwargs):
+        if method.upper() != 'GET' or self.cache is None or kwargs.get('stream'):
+            return super().request(method, url, *args, **kwargs)
+
+        entry = self.cache.lookup(url)
+        if entry is not None and self.cache.is_fresh(url, entry):
+            return self._cached_response(url, entry)
+
+        if entry is not None:
+            # 저장된 검증 헤더로 조건부 요청
+            headers = dict(kwargs.pop('headers', None) or {})
+            if 'ETag' in entry['headers']:
+                headers['If-None-Match'] = entry['headers']['ETag']
+            if 'Last-Modified' in entry['headers']:
+                headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+            kwargs['headers'] = headers
+
+        response = super().request(method, url, *args, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(url, response)
+            return self._cached_response(url, entry)
+
+        response.from_cache = False
+        if response.status_code == 200:
+            self.cache.store(url, response)
+        return response
+
+    def _cached_response(self, url, entry):
+        """캐시 항목으로 Response 객체 구성"""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = url
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = entry['body']
+        response.from_cache = True
+        return response
@@ -0,0 +1,191 @@
+# http_client.py
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+
+import requests
+
+# 재시도할 HTTP 상태 코드
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class DeadlineExceeded(Exception):
+    """실행 마감 시각이 지나 더 이상 요청하지 않음"""
+
+
+class CircuitOpenError(Exception):
+    """최근 연속 실패로 차단된 호스트"""
+
+
+class Deadline:
+    """전체 실행 마감 시각 (seconds=None이면 제한 없음)"""
+
+    def __init__(self, seconds=None):
+        self.expires_at = time.monotonic() + seconds if seconds else None
+
+    def remaining(self):
+        """남은 시간 (초, 제한 없으면 None)"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+
+class CircuitBreaker:
+    """호스트별 서킷 브레이커 (연속 실패 threshold회 → cooldown초 동안 바로 실패, 이후 1회 시험 요청)"""
+
+    def __init__(self, threshold=3, cooldown=60.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures = {}
+        self._opened_at = {}
+
+    def allow(self, host):
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if time.monotonic() - opened_at >= self.cooldown:
+                # 반개방: 시험 요청 하나만 통과시키고 다시 실패하면 바로 열림
+                del self._opened_at[host]
+                self._failures[host] = self.threshold - 1
+                return True
+            return False
+
+    def record_success(self, host):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+
+    def record_failure(self, host):
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.threshold:
+                self._opened_at[host] = time.monotonic()
+
+
+class HttpClient:
+    """공용 요청 계층: 타임아웃, 마감 시각, 지터 백오프 재시도, 헤지 요청, 호스트별 서킷 브레이커"""
+
+    def __init__(self, session, rate_limiter=None, timeout=(5, 15), retries=2, backoff=0.5,
+                 hedge_after=3.0, deadline=None, breaker=None, hedge_workers=8):
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        # 첫 응답이 hedge_after초 안에 안 오면 같은 GET을 한 번 더 보냄 (None이면 사용 안 함)
+        self.hedge_after = hedge_after
+        self.deadline = deadline or Deadline()
+        self.breaker = breaker or CircuitBreaker()
+        # 요청 하나가 첫 요청 + 헤지 요청으로 스레드를 2개까지 쓰므로 호출하는 쪽 동시 요청 수의 2배 이상이어야
+        # 첫 요청이 큐에서 기다리다 헤지되지 않음
+        self._hedge_pool = ThreadPoolExecutor(max_workers=hedge_workers, thread_name_prefix='hedge')
+
+    def get(self, url, stats=None, **kwargs):
+        """GET 요청 (stats dict가 주어지면 retries/hedged 횟수 기록)"""
+        stats = stats if stats is not None else {}
+        host = urlparse(url).netloc
+
+        for attempt in range(self.retries + 1):
+            self._check(host)
+            try:
+                if self.hedge_after and not kwargs.get('stream'):
+                    response = self._hedged_send(url, stats, **kwargs)
+                else:
+                    response = self._send(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.breaker.record_failure(host)
+                if attempt == self.retries:
+                    raise
+                print(f"🔄 재시도 {attempt + 1}/{self.retries}: {url} ({type(e).__name__})")
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success(host)
+                    return response
+                self.breaker.record_failure(host)
+                if attempt == self.retries:
+                    return response
+                print(f"🔄 재시도 {attempt + 1}/{self.retries}: {url} (HTTP {response.status_code})")
+                response.close()
+
+            stats['retries'] = attempt + 1
+            self._sleep_backoff(attempt)
+
+    def _check(self, host):
+        if self.deadline.expired():
+            raise DeadlineExceeded("실행 마감 시각 초과")
+        if not self.breaker.allow(host):
+            raise CircuitOpenError(f"{host} 연속 실패로 잠시 차단됨")
+
+    def _timeout(self):
+        """마감 시각까지 남은 시간을 넘지 않도록 (connect, read) 타임아웃 조정"""
+        remaining = self.deadline.remaining()
+        if remaining is None:
+            return self.timeout
+        if remaining <= 0:
+            raise DeadlineExceeded("실행 마감 시각 초과")
+        connect, read = self.timeout
+        return (min(connect, remaining), min(read, remaining))
+
+    def _send(self, url, **kwargs):
+        if self.rate_limiter:
+            self.rate_limiter.wait(url)
+        return self._request(url, **kwargs)
+
+    def _request(self, url, **kwargs):
+        kwargs.setdefault('timeout', self._timeout())
+        return self.session.get(url, **kwargs)
+
+    def _hedged_send(self, url, stats, **kwargs):
+        """첫 요청이 느리면 같은 요청을 하나 더 보내 먼저 성공한 응답 사용
+
+        호스트 간격 대기는 호출한 스레드에서 먼저 끝내므로 대기 시간은 느린 응답으로 치지 않음
+        """
+        if self.rate_limiter:
+            self.rate_limiter.wait(url)
+        first = self._hedge_pool.submit(self._request, url, **kwargs)
+        done, _ = wait([first], timeout=self.hedge_after)
+        if done:
+            return first.result()
+
+        # 헤지 요청도 호스트 간격을 지킴 - 지금 빈 슬롯이 없으면 첫 요청만 기다림
+        if self.rate_limiter and not self.rate_limiter.try_acquire(url):
+            stats['hedge_skipped'] = stats.get('hedge_skipped', 0) + 1
+            return first.result()
+        stats['hedged'] = stats.get('hedged', 0) + 1
+        second = self._hedge_pool.submit(self._request, url, **kwargs)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # 진 쪽 응답은 도착하는 대로 닫음
+                    for other in pending:
+                        other.add_done_callback(_close_response)
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _sleep_backoff(self, attempt):
+        """지수 백오프 + 지터 (마감 시각을 넘기지 않음)"""
+        delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+        remaining = self.deadline.remaining()
+        if remaining is not None:
+            delay = min(delay, remaining)
+        time.sleep(delay)
+
+    def close(self):
+        self._hedge_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _close_response(future):
+    if future.exception() is None:
+        future.result().close()
@@ -0,0 +1,236 @@
+# local_servers.py
+"""벤치마크/확인용 로컬 대체 서버
+
+    HTTP/1.1, HTTP/2 h2c - 모든 경로에 같은 본문을 지연 후 응답
+    SMTP - 지정한 수신자는 거부하고 나머지 메시지는 받아 둠
+"""
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class Http1StandIn:
+    """keep-alive를 지원하는 HTTP/1.1 서버"""
+
+    def __init__(self, body, latency=0.03):
+        self.body = body
+        self.latency = latency
+        self.connections = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                server.connections += 1
+                super().setup()
+
+            def do_GET(self):
+                time.sleep(server.latency)
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(server.body)))
+                self.end_headers()
+                self.wfile.write(server.body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self._httpd.server_port}'
+
+    def __enter__(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class H2StandIn:
+    """h2 라이브러리로 만든 HTTP/2 평문(h2c, prior knowledge) 서버 - 한 연결에서 여러 스트림 동시 처리"""
+
+    def __init__(self, body, latency=0.03):
+        import h2.config  # noqa: F401  (httpx[http2] 설치 시 함께 설치됨)
+
+        self.body = body
+        self.latency = latency
+        self.connections = 0
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(('127.0.0.1', 0))
+        self._sock.listen()
+        self.url = f'http://127.0.0.1:{self._sock.getsockname()[1]}'
+        self._running = True
+
+    def __enter__(self):
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._running = False
+        self._sock.close()
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        import h2.config
+        import h2.connection
+        import h2.events
+        import h2.exceptions
+
+        h2_conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        lock = threading.Lock()
+        pending = {}
+
+        def flush():
+            # 흐름 제어 창이 허락하는 만큼만 본문 전송 (락 안에서 호출)
+            for stream_id in list(pending):
+                data = pending[stream_id]
+                try:
+                    while data:
+                        window = h2_conn.local_flow_control_window(stream_id)
+                        if window <= 0:
+                            break
+                        chunk = data[:min(window, h2_conn.max_outbound_frame_size)]
+                        h2_conn.send_data(stream_id, chunk)
+                        data = data[len(chunk):]
+                    if data:
+                        pending[stream_id] = data
+                    else:
+                        h2_conn.end_stream(stream_id)
+                        del pending[stream_id]
+                except h2.exceptions.StreamClosedError:
+                    del pending[stream_id]
+            conn.sendall(h2_conn.data_to_send())
+
+        def respond(stream_id):
+            with lock:
+                h2_conn.send_headers(stream_id, [
+                    (':status', '200'),
+                    ('content-type', 'text/html; charset=utf-8'),
+                    ('content-length', str(len(self.body))),
+                ])
+                pending[stream_id] = self.body
+                flush()
+
+        with lock:
+            h2_conn.initiate_connection()
+            conn.sendall(h2_conn.data_to_send())
+
+        try:
+            while True:
+                data = conn.recv(65535)
+                if not data:
+                    break
+                with lock:
+                    events = h2_conn.receive_data(data)
+                    for event in events:
+                        if isinstance(event, h2.events.RequestReceived):
+                            timer = threading.Timer(self.latency, respond, args=(event.stream_id,))
+                            timer.daemon = True
+                            timer.start()
+                        elif isinstance(event, h2.events.StreamReset):
+                            pending.pop(event.stream_id, None)
+                        elif isinstance(event, h2.events.ConnectionTerminated):
+                            return
+                    flush()
+        except (OSError, h2.exceptions.ProtocolError):
+            pass
+        finally:
+            conn.close()
+
+
+class SmtpStandIn:
+    """최소한의 SMTP 서버 (STARTTLS/AUTH 없음) - 실제 서버처럼 열린 트랜잭션에 MAIL이 오면 503으로 거부"""
+
+    def __init__(self, rejected=()):
+        self.rejected = set(rejected)
+        self.delivered = []
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(('127.0.0.1', 0))
+        self._sock.listen()
+        self.host, self.port = self._sock.getsockname()
+        self._running = True
+
+    def __enter__(self):
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._running = False
+        self._sock.close()
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        reader = conn.makefile('rb')
+
+        def reply(line):
+            conn.sendall(line.encode('ascii') + b'\r\n')
+
+        reply('220 localhost stand-in')
+        sender = None
+        recipients = []
+        with conn:
+            for raw in reader:
+                command = raw.decode('utf-8', 'replace').strip()
+                verb = command[:4].upper()
+                if verb in ('EHLO', 'HELO'):
+                    reply('250 localhost')
+                elif verb == 'MAIL':
+                    if sender is not None:
+                        reply('503 5.5.1 Error: nested MAIL command')
+                        continue
+                    sender = command[10:].strip('<>')
+                    reply('250 2.1.0 Ok')
+                elif verb == 'RCPT':
+                    if sender is None:
+                        reply('503 5.5.1 Error: need MAIL command')
+                        continue
+                    address = command[8:].strip('<>')
+                    if address in self.rejected:
+                        reply('550 5.1.1 Recipient address rejected')
+                        continue
+                    recipients.append(address)
+                    reply('250 2.1.5 Ok')
+                elif verb == 'DATA':
+                    if not recipients:
+                        reply('503 5.5.1 Error: need RCPT command')
+                        continue
+                    reply('354 End data with <CR><LF>.<CR><LF>')
+                    lines = []
+                    for line in reader:
+                        if line == b'.\r\n':
+                            break
+                        lines.append(line[1:] if line.startswith(b'..') else line)
+                    self.delivered.append((recipients, b''.join(lines)))
+                    sender, recipients = None, []
+                    reply('250 2.0.0 Ok: queued')
+                elif verb == 'RSET':
+                    sender, recipients = None, []
+                    reply('250 2.0.0 Ok')
+                elif verb == 'NOOP':
+                    reply('250 2.0.0 Ok')
+                elif verb == 'QUIT':
+                    reply('221 2.0.0 Bye')
+                    return
+                else:
+                    reply('502 5.5.2 Error: command not recognized')
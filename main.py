@@ -1,387 +1,946 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 import time
 import re
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 import json
+import argparse
+import sys
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from email_sender import NewsEmailSender
+from digest_archive import DigestArchive
+from rate_limiter import HostRateLimiter
+from http_cache import HttpCache, CachedSession, MISSING
+from article_store import ArticleStore, yonhap_article_id
+from html_parser import HtmlParser, parse_until
+from embedded_json import scan_embedded_json, find_headline
+from browser_pool import BrowserPool
+from metrics import metrics
+from http_client import HttpClient, Deadline, DeadlineExceeded, CircuitOpenError
+from story_clusters import merge_story_updates
 
 KST = timezone(timedelta(hours=9))
 
+# 외신 헤드라인 동시 요청 수 (사이트 5개)
+FOREIGN_WORKERS = 5
+
+# 실행별 크롤링 결과 아카이브 (GitHub Actions에서는 .cache와 함께 보존)
+ARCHIVE_PATH = '.cache/archive'
+
+# 연합뉴스 섹션 (URL 경로 → 이메일에 표시할 이름)
+YONHAP_SECTIONS = {
+    'international': '국제',
+    'north-korea': '북한',
+    'economy': '경제',
+    'politics': '정치',
+}
+
 class NewsCrawler:
-    def __init__(self):
+    def __init__(self, min_interval=2.0, host_intervals=None, yonhap_workers=4, yonhap_interval=0.2,
+                 yonhap_max_pages=10, cache_path='.cache/http_cache.sqlite',
+                 store_path='.cache/articles.sqlite', parser_backend='lxml', streaming=True,
+                 stream_byte_budget=2 * 1024 * 1024, deadline=None, hedge_after=3.0, http2=False,
+                 yonhap_sections=('international',), merge_updates=True,
+                 embedded_byte_budget=8 * 1024 * 1024):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        # HTTP/2 전송(httpx) 또는 디스크 HTTP 캐시 (cache_path=None이면 사용 안 함)
+        if http2:
+            from http2_transport import Http2Session
+            session = Http2Session()
+        elif cache_path:
+            session = CachedSession(HttpCache(cache_path))
+        else:
+            session = requests.Session()
+        session.headers.update(self.headers)
+        # 호스트별 요청 간격 (연합뉴스는 본문을 여러 개 동시에 가져오므로 짧은 간격 적용)
+        if host_intervals is None:
+            host_intervals = {'www.yna.co.kr': yonhap_interval}
+        # 연합뉴스 본문 동시 요청 수
+        self.yonhap_workers = yonhap_workers
+        # 연합뉴스 목록 페이지 최대 탐색 수 (시간 범위가 끝나면 그 전에 멈춤)
+        self.yonhap_max_pages = yonhap_max_pages
+        self.yonhap_page_stats = {'fetched': 0, 'useful': 0}
+        # 수집할 연합뉴스 섹션 (YONHAP_SECTIONS의 키)
+        self.yonhap_sections = list(yonhap_sections)
+        self.yonhap_section_stats = {}
+        # 같은 기사의 속보/갱신판은 최신 기사 하나만 본문을 가져오고 나머지는 관련 기사로 표시
+        self.merge_updates = merge_updates
+        # 이미 가져온 연합뉴스 기사 저장소 (store_path=None이면 사용 안 함)
+        self.article_store = ArticleStore(store_path) if store_path else None
+        self.rate_limiter = HostRateLimiter(min_interval, host_intervals)
+        # 공용 요청 계층 (타임아웃, 마감 시각, 재시도, 헤지 요청, 서킷 브레이커)
+        self.deadline = deadline or Deadline()
+        self.http = HttpClient(session, self.rate_limiter, deadline=self.deadline, hedge_after=hedge_after,
+                               hedge_workers=2 * max(yonhap_workers, len(self.yonhap_sections), FOREIGN_WORKERS))
+        # 사이트별 파서 (필요한 영역만 파싱, 선택자는 한 번만 컴파일)
+        self.parsers = {
+            'bbc': HtmlParser(parser_backend, scope={'id': 'main-content'},
+                              selectors=["#main-content article section div div div", 'a[href*="/news/"]']),
+            'cnn': HtmlParser(parser_backend, scope={'class_': 'container__title--emphatic'},
+                              selectors=['.container__title--emphatic a', 'h2']),
+            'fox': HtmlParser(parser_backend, scope={'class_': 'big-top'},
+                              selectors=['.big-top .content article .info-header h3.title a']),
+            # 헤드라인의 부모 링크(a)를 찾아야 하므로 NYT는 영역 제한 없음
+            'nyt': HtmlParser(parser_backend, selectors=['.story-wrapper .indicate-hover']),
+            'yonhap_listing': HtmlParser(parser_backend, scope={'name': 'div', 'class_': 'section01'},
+                                         selectors=['div.section01 a.tit-news', 'div.section01 span.txt-time']),
+            'yonhap_article': HtmlParser(parser_backend, scope={'id': 'articleWrap'},
+                                         selectors=['#articleWrap div.story-news', 'p']),
+        }
+        for name, parser in self.parsers.items():
+            parser.name = name
+        # 헤드라인 스트리밍: 이 요소가 닫히면 지금까지 받은 부분으로 헤드라인 추출 시도
+        self.streaming = streaming
+        self.stream_byte_budget = stream_byte_budget
+        self.stream_markers = {
+            'bbc': ('article', None),
+            'cnn': (None, 'container__title--emphatic'),
+            'fox': (None, 'info-header'),
+            'nyt': (None, 'story-wrapper'),
+        }
+        self.stream_stats = {}
+        # 헤드라인 데이터를 JSON으로 담고 있는 script 블록 표시와 더 찾지 않을 위치
+        # - 있으면 DOM 파싱/브라우저 없이 이것만 읽음
+        self.embedded_markers = {
+            'wp': (b'id="__NEXT_DATA__"', None),
+            'nyt': (b'window.__preloadedData', None),
+            # JSON-LD는 <head> 안에 있으므로 </head>까지 없으면 바로 DOM으로
+            'cnn': (b'application/ld+json', b'</head>'),
+        }
+        # JSON이 문서 끝쪽에 있어 먼저 찾으면 페이지를 다 받게 되는 사이트 - DOM 스트리밍이 실패할 때만 읽음
+        self.embedded_after_dom = {'nyt'}
+        # DOM 추출이 없는 사이트(WP)의 JSON 탐색 한도 (나머지는 stream_byte_budget 안에서만 찾음)
+        self.embedded_byte_budget = embedded_byte_budget
+        # JS 렌더링이 필요한 사이트용 헤드리스 브라우저 (처음 사용할 때 실행, 이후 재사용)
+        self.browser_pool = BrowserPool()
+
+    def start_run(self, deadline_seconds=None):
+        """새 실행 준비 (데몬 모드에서 연결/캐시/브라우저는 유지하고 마감 시각과 실행별 통계만 새로 시작)"""
+        self.deadline = Deadline(deadline_seconds)
+        self.http.deadline = self.deadline
+        self.stream_stats = {}
+        self.yonhap_page_stats = {'fetched': 0, 'useful': 0}
+        self.yonhap_section_stats = {}
+        return self.deadline
+
+    @property
+    def session(self):
+        return self.http.session
+
+    @session.setter
+    def session(self, session):
+        self.http.session = session
+
+    def _get(self, url, **kwargs):
+        """공용 요청 계층을 통한 GET 요청 (요청마다 fetch 지표 기록)"""
+        with metrics.span('fetch', site=urlparse(url).netloc, url=url) as span:
+            response = self.http.get(url, stats=span, **kwargs)
+            span['status'] = response.status_code
+            span['from_cache'] = getattr(response, 'from_cache', False)
+            # 스트리밍 응답의 크기는 다 읽은 뒤 fetch_headline에서 기록
+            if not kwargs.get('stream') and not span['from_cache']:
+                span['bytes'] = len(response.content)
+        return response
     
-    def crawl_bbc_headline(self):       
-        try:
-            url = "https://www.bbc.com/news"
-            response = self.session.get(url)
+    def find_embedded_headline(self, site, url, chunks, buffer, byte_budget):
+        """script 블록에 들어 있는 헤드라인 JSON만 찾아 추출 (없으면 None, 읽은 바이트는 buffer에 남음)"""
+        with metrics.span('embedded_json', site=site) as span:
+            headline = None
+            marker, stop_at = self.embedded_markers[site]
+            for data in scan_embedded_json(chunks, marker, buffer, byte_budget, stop_at):
+                headline = find_headline(data, url)
+                if headline is not None:
+                    break
+            span['bytes'] = len(buffer)
+            span['items'] = 1 if headline else 0
+        return headline
+    
+    def headline_sources(self, site, extract):
+        """헤드라인을 찾아볼 순서 ('json' = 임베디드 JSON, 'dom' = DOM 추출)"""
+        sources = ['dom'] if extract is not None else []
+        if site in self.embedded_markers:
+            if site in self.embedded_after_dom:
+                sources.append('json')
+            else:
+                sources.insert(0, 'json')
+        return sources
+    
+    def fetch_headline(self, site, url, extract):
+        """헤드라인 페이지를 스트리밍으로 받다가 헤드라인을 찾으면 연결을 끊고 결과 반환
+
+        headline_sources 순서대로 임베디드 JSON/DOM 추출을 시도하고, 실패하면 이미 받은 바이트부터 다음 방법으로 이어감
+        (extract가 None이면 DOM 추출 없이 임베디드 JSON만)
+        """
+        parser = self.parsers.get(site)
+        sources = self.headline_sources(site, extract)
+        # DOM으로 넘길 수 있으면 JSON도 DOM 스트리밍 한도 안에서만 찾음
+        json_budget = self.stream_byte_budget if extract is not None else self.embedded_byte_budget
+        if not self.streaming:
+            response = self._get(url)
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
+            error = ValueError("임베디드 JSON에서 헤드라인을 찾지 못함")
+            for source in sources:
+                if source == 'json':
+                    headline = self.find_embedded_headline(site, url, [response.content], bytearray(), None)
+                    if headline is not None:
+                        return headline
+                    continue
+                try:
+                    return extract(parser.parse(response.content))
+                except Exception as e:
+                    error = e
+            raise error
+        
+        with self._get(url, stream=True) as response:
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size=16 * 1024)
+            headline = None
+            error = ValueError("임베디드 JSON에서 헤드라인을 찾지 못함")
+            for source in sources:
+                buffer = bytearray()
+                if source == 'json':
+                    headline = self.find_embedded_headline(site, url, chunks, buffer, json_budget)
+                    stopped_early = headline is not None
+                else:
+                    try:
+                        headline, _, stopped_early = parse_until(
+                            chunks,
+                            parser,
+                            extract,
+                            self.stream_markers[site],
+                            byte_budget=self.stream_byte_budget,
+                            buffer=buffer,
+                        )
+                    except Exception as e:
+                        error = e
+                bytes_read = len(buffer)
+                if headline is not None:
+                    break
+                # 이미 받은 부분부터 이어서 다음 방법으로 (복사본만 남기고 버퍼는 바로 해제)
+                chunks = itertools.chain([bytes(buffer)], chunks)
+                buffer = None
+            if headline is None:
+                raise error
+            # 전송 크기는 압축된 상태 기준으로 비교
+            try:
+                wire_bytes = response.raw.tell()
+            except Exception:
+                wire_bytes = bytes_read
+            content_length = response.headers.get('Content-Length')
+        
+        total = int(content_length) if content_length and content_length.isdigit() else None
+        if total and wire_bytes >= total:
+            stopped_early = False
+        self.stream_stats[site] = {
+            'read': wire_bytes,
+            'total': total,
+            'saved': max(0, total - wire_bytes) if total else 0,
+            'stopped_early': stopped_early,
+            'source': source,
+        }
+        metrics.record('stream', site=site, bytes=wire_bytes, total_bytes=total, stopped_early=stopped_early,
+                       source=source)
+        return headline
+
+    def crawl_bbc_headline(self):       
+        def extract(soup):
             # BBC 메인 컨텐츠 영역
             main_content = soup.select_one("#main-content article section div div div")
             
             headline_link = main_content.select_one('a[href*="/news/"]')
             
-            title = headline_link.get_text(strip=True)
-            link = urljoin(url, headline_link.get('href', ''))
-            
-            print("BBC 메인 헤드라인:")
-            print(f"제목: {title}")
-            print(f"링크: {link}")
             return {
-                'title': title,
-                'link': link
+                'title': headline_link.text(),
+                'link': urljoin(url, headline_link.attr('href'))
             }
+        
+        try:
+            url = "https://www.bbc.com/news"
+            headline = self.fetch_headline('bbc', url, extract)
+            
+            print("BBC 메인 헤드라인:")
+            print(f"제목: {headline['title']}")
+            print(f"링크: {headline['link']}")
+            return headline
             
         except Exception as e:
             print(f"BBC 크롤링 실패: {e}")
             return None
     
     def crawl_cnn_headline(self):       
-        try:
-            url = "https://www.cnn.com/"
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
+        def extract(soup):
             # CNN 메인 헤드라인 - 제공된 구조 기반
             headline_link = soup.select_one('.container__title--emphatic a')
             
             title_element = headline_link.select_one('h2') or headline_link
-            title = title_element.get_text(strip=True)
-            link = urljoin(url, headline_link.get('href', ''))
-            
-            print("CNN 메인 헤드라인:")
-            print(f"제목: {title}")
-            print(f"링크: {link}")
             return {
-                'title': title,
-                'link': link
+                'title': title_element.text(),
+                'link': urljoin(url, headline_link.attr('href'))
             }
-
-            return None
+        
+        try:
+            url = "https://www.cnn.com/"
+            headline = self.fetch_headline('cnn', url, extract)
+            
+            print("CNN 메인 헤드라인:")
+            print(f"제목: {headline['title']}")
+            print(f"링크: {headline['link']}")
+            return headline
             
         except Exception as e:
             print(f"CNN 크롤링 실패: {e}")
             return None
     
     def crawl_fox_headline(self):       
-        try:
-            url = "https://www.foxnews.com/"
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
+        def extract(soup):
             # Fox News 메인 헤드라인 - big-top 영역의 첫 번째 기사
             headline_link = soup.select_one('.big-top .content article .info-header h3.title a')
             
-            title = headline_link.get_text(strip=True)
-            link = urljoin(url, headline_link.get('href', ''))
-            
-            print("Fox News 메인 헤드라인:")
-            print(f"제목: {title}")
-            print(f"링크: {link}")
             return {
-                'title': title,
-                'link': link
+                'title': headline_link.text(),
+                'link': urljoin(url, headline_link.attr('href'))
             }
-
-            return None
+        
+        try:
+            url = "https://www.foxnews.com/"
+            headline = self.fetch_headline('fox', url, extract)
+            
+            print("Fox News 메인 헤드라인:")
+            print(f"제목: {headline['title']}")
+            print(f"링크: {headline['link']}")
+            return headline
             
         except Exception as e:
             print(f"Fox News 크롤링 실패: {e}")
             return None
     
     def crawl_nyt_headline(self):       
-        try:
-            url = "https://www.nytimes.com/"
-            response = self.session.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
+        def extract(soup):
             # NYT 메인 헤드라인 - story-wrapper 영역의 링크
             headline_link = soup.select_one('.story-wrapper .indicate-hover')
             
             parent_link = headline_link.find_parent('a')
-            title = headline_link.get_text(strip=True)
-            link = urljoin(url, parent_link.get('href', ''))
-            
-            print("NYT 메인 헤드라인:")
-            print(f"제목: {title}")
-            print(f"링크: {link}")
             return {
-                'title': title,
-                'link': link
+                'title': headline_link.text(),
+                'link': urljoin(url, parent_link.attr('href'))
             }
+        
+        try:
+            url = "https://www.nytimes.com/"
+            headline = self.fetch_headline('nyt', url, extract)
             
-            return None
+            print("NYT 메인 헤드라인:")
+            print(f"제목: {headline['title']}")
+            print(f"링크: {headline['link']}")
+            return headline
             
         except Exception as e:
             print(f"NYT 크롤링 실패: {e}")
             return None
 
-    def crawl_wp_headline_selenium(self):
-        """Selenium으로 Washington Post 메인 헤드라인 크롤링"""
-        driver = None
+    def crawl_wp_headline(self):
+        """Washington Post 메인 헤드라인 (페이지의 __NEXT_DATA__ JSON 우선, 못 찾으면 브라우저 사용)"""
         try:
-            # Chrome 옵션 설정
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')  # 브라우저 창 숨기기
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            # WebDriver 초기화
-            driver = webdriver.Chrome(options=chrome_options)
-            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
             url = "https://www.washingtonpost.com/"
-            driver.get(url)
+            headline = self.fetch_headline('wp', url, None)
             
-            # 페이지 로딩 대기
-            wait = WebDriverWait(driver, 10)
+            print("Washington Post 메인 헤드라인:")
+            print(f"제목: {headline['title']}")
+            print(f"링크: {headline['link']}")
+            return headline
             
-            # 요소가 나타날 때까지 대기
-            element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, '.headline h2 a span')))
+        except (DeadlineExceeded, CircuitOpenError) as e:
+            # 마감 시각이 지났거나 호스트가 차단된 상태면 브라우저를 띄우지 않음 (발송 시각 우선)
+            print(f"WP 크롤링 중단: {e}")
+            return None
+        except Exception as e:
+            if self.deadline.expired():
+                print(f"WP 임베디드 JSON 추출 실패 - 마감 시각이 지나 브라우저 재시도 생략: {e}")
+                return None
+            print(f"WP 임베디드 JSON 추출 실패 - 브라우저로 재시도: {e}")
+            return self.crawl_wp_headline_selenium()
+
+    def crawl_wp_headline_selenium(self):
+        """Selenium으로 Washington Post 메인 헤드라인 크롤링 (브라우저 풀의 새 탭 사용)"""
+        try:
+            # selenium은 이 사이트를 크롤링할 때만 가져옴
+            from selenium.webdriver.common.by import By
             
-            if element:
+            url = "https://www.washingtonpost.com/"
+            with self.browser_pool.page() as driver:
+                driver.get(url)
+                
+                # 헤드라인 요소가 나타날 때까지만 대기
+                element = self.browser_pool.wait_for(driver, '.headline h2 a span', timeout=10)
+                
                 title = element.text.strip()
                 
                 # 부모 링크 찾기
                 link_element = element.find_element(By.XPATH, './ancestor::a[1]')
                 link = urljoin(url, link_element.get_attribute('href'))
-                
-                print("Washington Post 메인 헤드라인:")
-                print(f"제목: {title}")
-                print(f"링크: {link}")
-                
-                return {
-                    'title': title,
-                    'link': link
-                }
+            
+            print("Washington Post 메인 헤드라인:")
+            print(f"제목: {title}")
+            print(f"링크: {link}")
+            
+            return {
+                'title': title,
+                'link': link
+            }
             
         except Exception as e:
             print(f"❌ WP Selenium 크롤링 실패: {e}")
             return None
-            
-        finally:
-            if driver:
-                driver.quit()
 
-    def crawl_yonhap_request(self):
-        """연합뉴스 국제 기사 - requests로 웹페이지에서 크롤링 (수정된 버전)"""
-        def parse_yonhap_time(time_text):
-            """연합뉴스 시간 텍스트 파싱 (09-07 20:52 형식)"""
-            try:
-                # 현재 연도 가져오기
-                current_year = datetime.now().year
+    def close(self):
+        """브라우저 등 크롤러가 잡고 있는 자원 정리"""
+        self.browser_pool.close()
+        self.http.close()
+        if hasattr(self.session, 'close'):
+            self.session.close()
+
+    def parse_yonhap_time(self, time_text):
+        """연합뉴스 시간 텍스트 파싱 (09-07 20:52 형식)"""
+        try:
+            # 현재 연도 가져오기
+            current_year = datetime.now().year
+            
+            # 09-07 20:52 형식 파싱
+            if len(time_text.split()) == 2:
+                date_part, time_part = time_text.split()
                 
-                # 09-07 20:52 형식 파싱
-                if len(time_text.split()) == 2:
-                    date_part, time_part = time_text.split()
+                # 월-일 시:분 형식
+                if '-' in date_part and ':' in time_part:
+                    month, day = date_part.split('-')
+                    hour, minute = time_part.split(':')
                     
-                    # 월-일 시:분 형식
-                    if '-' in date_part and ':' in time_part:
-                        month, day = date_part.split('-')
-                        hour, minute = time_part.split(':')
-                        
-                        parsed_time = datetime(
-                            year=current_year,
-                            month=int(month),
-                            day=int(day),
-                            hour=int(hour),
-                            minute=int(minute),
-                            tzinfo=KST
-                        )
-                        
-                        return parsed_time
+                    parsed_time = datetime(
+                        year=current_year,
+                        month=int(month),
+                        day=int(day),
+                        hour=int(hour),
+                        minute=int(minute),
+                        tzinfo=KST
+                    )
+                    
+                    return parsed_time
+            
+            return None
+            
+        except Exception as e:
+            print(f"시간 파싱 실패: {time_text}, 오류: {e}")
+            return None
+
+    def get_yonhap_content_summary(self, url):
+        """연합뉴스 기사 본문 첫 2문단 가져오기 (캐시 적중/304면 파싱 생략)"""
+        try:
+            with metrics.span('summary', site='yonhap') as span:
+                response = self._get(url)
+                response.raise_for_status()
                 
-                return None
+                # 캐시에서 온 응답이면 이전에 추출해 둔 요약 재사용
+                cache = getattr(self.session, 'cache', None)
+                if cache is not None and getattr(response, 'from_cache', False):
+                    summary = cache.get_derived(url, 'yonhap_summary')
+                    if summary is not MISSING:
+                        span['from_cache'] = True
+                        span['items'] = 1 if summary else 0
+                        return summary
                 
-            except Exception as e:
-                print(f"시간 파싱 실패: {time_text}, 오류: {e}")
+                summary = self.extract_yonhap_summary(response.content)
+                if cache is not None:
+                    cache.set_derived(url, 'yonhap_summary', summary)
+                span['items'] = 1 if summary else 0
+                return summary
+            
+        except Exception as e:
+            print(f"본문 가져오기 실패: {e}")
+            return None
+
+    def extract_yonhap_summary(self, content):
+        """연합뉴스 기사 HTML에서 본문 첫 2문단 추출 (정확한 선택자)"""
+        soup = self.parsers['yonhap_article'].parse(content)
+        
+        # articleWrap 안의 div.story-news 안의 p 태그들만 가져오기
+        story_div = soup.select_one('#articleWrap div.story-news')
+        
+        if story_div:
+            # p 태그들만 추출
+            paragraphs = story_div.select('p')
+            
+            # 텍스트만 추출하고 빈 문단 제거
+            paragraph_texts = []
+            for p in paragraphs:
+                text = p.text()
+                if text and len(text) > 20:  # 20자 이상인 문단만
+                    paragraph_texts.append(text)
+            
+            # 첫 2문단만 가져오기
+            if len(paragraph_texts) >= 2:
+                summary = paragraph_texts[0] + ' ' + paragraph_texts[1]
+            elif len(paragraph_texts) == 1:
+                summary = paragraph_texts[0]
+            else:
                 return None
+            
+            # 길이 제한 (500자)
+            if len(summary) > 500:
+                summary = summary[:500] + '...'
+            
+            return summary
+        
+        return None
+
+    def parse_yonhap_listing(self, soup):
+        """연합뉴스 목록 페이지에서 기사 정보만 추출 (본문은 가져오지 않음, 시간 파싱 실패 시 published=None)"""
+        articles = []
+        
+        # div.section01 안의 뉴스 링크들
+        news_links = soup.select('div.section01 a.tit-news')
 
-        def get_yonhap_content_summary(url):
-            """연합뉴스 기사 본문 첫 2문단 가져오기 (정확한 선택자)"""
+        # div.section01 안의 시간 요소들  
+        time_elements = soup.select('div.section01 span.txt-time')
+        
+        # 각 뉴스 링크 처리
+        for i, link in enumerate(news_links):
             try:
-                response = self.session.get(url)
-                response.raise_for_status()
+                title = link.text()
+                href = link.attr('href')
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
+                # 절대 URL로 변환
+                full_link = urljoin('https://www.yna.co.kr', href)
                 
-                # articleWrap 안의 div.story-news 안의 p 태그들만 가져오기
-                story_div = soup.select_one('#articleWrap div.story-news')
-                
-                if story_div:
-                    # p 태그들만 추출
-                    paragraphs = story_div.select('p')
-                    
-                    # 텍스트만 추출하고 빈 문단 제거
-                    paragraph_texts = []
-                    for p in paragraphs:
-                        text = p.get_text(strip=True)
-                        if text and len(text) > 20:  # 20자 이상인 문단만
-                            paragraph_texts.append(text)
-                    
-                    # 첫 2문단만 가져오기
-                    if len(paragraph_texts) >= 2:
-                        summary = paragraph_texts[0] + ' ' + paragraph_texts[1]
-                    elif len(paragraph_texts) == 1:
-                        summary = paragraph_texts[0]
-                    else:
-                        return None
-                    
-                    # 길이 제한 (500자)
-                    if len(summary) > 500:
-                        summary = summary[:500] + '...'
-                    
-                    return summary
-                
-                return None
+                # 시간 정보 찾기
+                time_text = time_elements[i].text()
+                article_time = self.parse_yonhap_time(time_text)
                 
+                articles.append({
+                    'title': title,
+                    'link': full_link,
+                    'published': article_time,
+                    'content': None
+                })
+
             except Exception as e:
-                print(f"본문 가져오기 실패: {e}")
-                return None
-                
-        print("=== 연합뉴스 국제 기사 테스트 (requests) ===")
-        try:
-            # 시간 필터링 (전날 23:00 ~ 당일 08:30)
-            now = datetime.now(KST)
-            yesterday_23 = (now - timedelta(days=1)).replace(hour=23, minute=0, second=0, microsecond=0)
-            today_0830 = now.replace(hour=8, minute=30, second=0, microsecond=0)
-            
-            print(f"필터링 시간: {yesterday_23} ~ {today_0830}")
-            
-            filtered_articles = []
+                print(f"기사 {i+1} 처리 중 오류: {e}")
+                continue
+        
+        return articles
+
+    def walk_yonhap_pages(self, window_start, window_end, section='international'):
+        """시간 범위가 끝날 때까지 섹션 목록 페이지를 넘기며 범위 내 기사 수집 (최대 yonhap_max_pages)"""
+        filtered_articles = []
+        pages_fetched = 0
+        pages_useful = 0
+        
+        for page in range(1, self.yonhap_max_pages + 1):
+            url = f"https://www.yna.co.kr/{section}/all/{page}"
+            print(f"\n[{section}] 페이지 {page} 크롤링: {url}")
             
-            # 1페이지와 2페이지 크롤링
-            for page in [1, 2, 3]:
-                url = f"https://www.yna.co.kr/international/all/{page}"
-                print(f"\n페이지 {page} 크롤링: {url}")
-                
-                response = self.session.get(url)
+            try:
+                response = self._get(url)
                 response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # div.section01 안의 뉴스 링크들
-                news_links = soup.select('div.section01 a.tit-news')
+            except (DeadlineExceeded, CircuitOpenError) as e:
+                # 지금까지 모은 기사로 진행
+                print(f"⏰ 목록 탐색 중단: {e}")
+                break
+            except requests.RequestException as e:
+                # 재시도 후에도 실패한 페이지부터는 건너뛰고 지금까지 모은 기사로 진행
+                print(f"❌ [{section}] 페이지 {page} 요청 실패 - 목록 탐색 중단: {e}")
+                break
+            pages_fetched += 1
+            
+            # 기사 정보만 뽑고 응답 본문과 파싱 트리는 바로 버림
+            page_articles = self.parse_yonhap_listing(self.parsers['yonhap_listing'].parse(response.content))
+            response = None
+            
+            # 시간 필터링
+            in_window = [article for article in page_articles
+                         if article['published'] and window_start <= article['published'] <= window_end]
+            if in_window:
+                pages_useful += 1
+                filtered_articles.extend(in_window)
+            
+            # 페이지 전체가 시작 시각보다 오래됐으면 다음 페이지는 볼 필요 없음
+            times = [article['published'] for article in page_articles if article['published']]
+            if not times or max(times) < window_start:
+                break
+        else:
+            print(f"⚠️ 최대 페이지 수({self.yonhap_max_pages}) 도달 - 이후 기사는 누락될 수 있음")
+        
+        self.yonhap_section_stats[section] = {'fetched': pages_fetched, 'useful': pages_useful}
+        metrics.record('pagination', site=f'yonhap/{section}', pages_fetched=pages_fetched,
+                       pages_useful=pages_useful, items=len(filtered_articles))
+        print(f"\n[{section}] 페이지 통계: {pages_useful}/{pages_fetched} 페이지에서 기사 수집")
+        return filtered_articles
 
-                # div.section01 안의 시간 요소들  
-                time_elements = soup.select('div.section01 span.txt-time')
-                
-                # 각 뉴스 링크 처리
-                for i, link in enumerate(news_links):
-                    try:
-                        title = link.get_text(strip=True)
-                        href = link.get('href', '')
-                        
-                        # 절대 URL로 변환
-                        full_link = urljoin('https://www.yna.co.kr', href)
-                        
-                        # 시간 정보 찾기
-                        article_time = None
-                        time_text = time_elements[i].get_text(strip=True)
-                        article_time = parse_yonhap_time(time_text)
-                        
-                        # 시간 필터링
-                        if yesterday_23 <= article_time <= today_0830:
-                            content_summary = get_yonhap_content_summary(full_link)
-                            filtered_articles.append({
-                                'title': title,
-                                'link': full_link,
-                                'published': article_time,
-                                'content': content_summary
-                            })
-                            
-                            print(f"\n📰 기사 {len(filtered_articles)}:")
-                            print(f"제목: {title}")
-                            print(f"발행시간: {article_time}")
-                            print(f"링크: {full_link}")
+    def collect_yonhap_sections(self, window_start, window_end):
+        """섹션별 목록을 동시에 수집하고 기사 ID 기준으로 중복 제거 (본문 요청 전, 섹션 태그는 유지)"""
+        self.yonhap_section_stats = {}
+        
+        def walk_section(section):
+            try:
+                return self.walk_yonhap_pages(window_start, window_end, section)
+            except Exception as e:
+                print(f"❌ [{section}] 목록 크롤링 실패: {e}")
+                return []
+        
+        with ThreadPoolExecutor(max_workers=len(self.yonhap_sections)) as executor:
+            section_articles = list(executor.map(walk_section, self.yonhap_sections))
+        
+        # 섹션 순서 → 목록 순서대로, 처음 나온 기사에 다른 섹션 태그만 추가
+        index = {}
+        for section, articles in zip(self.yonhap_sections, section_articles):
+            label = YONHAP_SECTIONS.get(section, section)
+            for article in articles:
+                article_id = yonhap_article_id(article['link'])
+                if article_id in index:
+                    if label not in index[article_id]['sections']:
+                        index[article_id]['sections'].append(label)
+                    continue
+                article['sections'] = [label]
+                index[article_id] = article
+        
+        self.yonhap_page_stats = {
+            'fetched': sum(stats['fetched'] for stats in self.yonhap_section_stats.values()),
+            'useful': sum(stats['useful'] for stats in self.yonhap_section_stats.values()),
+        }
+        total = sum(len(articles) for articles in section_articles)
+        if total > len(index):
+            print(f"\n섹션 간 중복 제거: {total}개 → {len(index)}개")
+        return list(index.values())
 
-                    except Exception as e:
-                        print(f"기사 {i+1} 처리 중 오류: {e}")
-                        continue
+    def merge_yonhap_updates(self, articles):
+        """제목이 거의 같은 갱신판을 묶어 최신 기사만 남김 (본문 요청 전)"""
+        if not self.merge_updates or len(articles) < 2:
+            return articles
+        with metrics.span('cluster', site='yonhap') as span:
+            merged = merge_story_updates(articles)
+            span['items'] = len(merged)
+        if len(merged) < len(articles):
+            print(f"\n유사 기사 묶기: {len(articles)}개 → {len(merged)}개 (본문 요청 {len(articles) - len(merged)}개 절약)")
+        return merged
+
+    def iter_yonhap_summaries(self, articles):
+        """목록 순서대로 본문 요약을 붙인 기사를 하나씩 반환 (이미 본 기사는 저장소 사용)
+
+        요청은 최대 yonhap_workers * 2개만 앞서 보내므로 기사 수와 상관없이 메모리에 남는 본문/요약은 일정함.
+        반환하는 기사는 복사본이라 articles 목록에는 요약이 쌓이지 않음.
+        받는 쪽(렌더링 등)을 기다린 시간은 빼고 여기서 본문을 기다린 시간만 summaries 지표로 기록
+        """
+        if not articles:
+            return
+        workers = max(1, min(self.yonhap_workers, len(articles)))
+        source = iter(articles)
+        pending = deque()
+        reused = 0
+        waited = 0.0
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            def submit_next():
+                article = next(source, None)
+                if article is None:
+                    return
+                # 이전 실행에서 이미 요약을 가져온 기사는 다시 요청하지 않음
+                stored = self.article_store.get(article['link']) if self.article_store else None
+                if stored is not None:
+                    pending.append((article, None, stored['content']))
+                else:
+                    pending.append((article, executor.submit(self.get_yonhap_content_summary, article['link']), None))
+            
+            try:
+                start = time.perf_counter()
+                for _ in range(workers * 2):
+                    submit_next()
+                while pending:
+                    article, future, summary = pending.popleft()
+                    if future is None:
+                        reused += 1
+                    else:
+                        summary = future.result()
+                        # 요약을 못 가져온 기사는 다음 실행에서 다시 시도
+                        if self.article_store and summary is not None:
+                            self.article_store.save(dict(article, content=summary))
+                    submit_next()
+                    waited += time.perf_counter() - start
+                    yield dict(article, content=summary)
+                    start = time.perf_counter()
+                waited += time.perf_counter() - start
+            finally:
+                metrics.record('summaries', site='연합뉴스', items=len(articles), reused=reused,
+                               duration_ms=round(waited * 1000, 2))
+        
+        if reused:
+            print(f"저장소에서 재사용: {reused}개")
+
+    def fetch_yonhap_summaries(self, articles):
+        """기사 본문 요약을 제한된 수의 워커로 동시에 가져와 articles에 채움 (입력 순서 유지)"""
+        # 생성기를 끝까지 돌려야 저장소 재사용 통계가 출력됨 (zip은 목록이 먼저 끝나면 멈춤)
+        for i, fetched in enumerate(self.iter_yonhap_summaries(articles)):
+            articles[i]['content'] = fetched['content']
+        return articles
+
+    def yonhap_time_window(self, now=None):
+        """연합뉴스 수집 시간 범위 (전날 23:00 ~ 당일 08:30, KST)"""
+        now = now or datetime.now(KST)
+        yesterday_23 = (now - timedelta(days=1)).replace(hour=23, minute=0, second=0, microsecond=0)
+        today_0830 = now.replace(hour=8, minute=30, second=0, microsecond=0)
+        return yesterday_23, today_0830
+
+    def poll_yonhap(self, digest_at, deadline_seconds=300):
+        """다음 브리핑(digest_at) 시간 범위에서 지금까지 올라온 기사 본문을 미리 가져와 저장소에 저장
+
+        발송 시각에는 목록만 다시 보고 본문은 저장소에서 재사용하므로 바로 보낼 수 있음
+        """
+        if not self.article_store:
+            print("기사 저장소가 없어 미리 가져오기를 건너뜀")
+            return 0
+        window_start, window_end = self.yonhap_time_window(digest_at)
+        now = datetime.now(KST)
+        if now < window_start:
+            return 0
+        
+        self.start_run(deadline_seconds)
+        with metrics.span('poll', site='연합뉴스') as span:
+            articles = self.merge_yonhap_updates(self.collect_yonhap_sections(window_start, min(now, window_end)))
+            new_articles = [article for article in articles if self.article_store.get(article['link']) is None]
+            self.fetch_yonhap_summaries(new_articles)
+            span['items'] = len(new_articles)
+        print(f"🌙 연합뉴스 미리 가져오기: 새 기사 {len(new_articles)}개 (범위 내 {len(articles)}개)")
+        return len(new_articles)
+
+    def load_yonhap_from_store(self, now=None):
+        """네트워크 없이 저장소에서 시간 범위 내 연합뉴스 기사 재구성"""
+        if not self.article_store:
+            return []
+        window_start, window_end = self.yonhap_time_window(now)
+        return self.article_store.articles_between(window_start, window_end)
+
+    def list_yonhap_articles(self):
+        """연합뉴스 섹션별 목록에서 시간 범위 내 기사 정보만 수집 (본문 없음, 갱신판은 묶음)"""
+        sections = ', '.join(YONHAP_SECTIONS.get(section, section) for section in self.yonhap_sections)
+        print(f"=== 연합뉴스 기사 크롤링 ({sections}) ===")
+        
+        # 시간 필터링 (전날 23:00 ~ 당일 08:30)
+        yesterday_23, today_0830 = self.yonhap_time_window()
+        
+        print(f"필터링 시간: {yesterday_23} ~ {today_0830}")
+        
+        filtered_articles = self.collect_yonhap_sections(yesterday_23, today_0830)
+        filtered_articles = self.merge_yonhap_updates(filtered_articles)
+        print(f"\n✅ 시간 범위 내 총 기사 수: {len(filtered_articles)}")
+        return filtered_articles
+
+    def crawl_yonhap_request(self):
+        """연합뉴스 섹션별 기사 - requests로 웹페이지에서 크롤링 (기본은 국제 섹션, 요약까지 채운 목록 반환)"""
+        try:
+            filtered_articles = self.list_yonhap_articles()
+            
+            # 필터링된 기사 본문 동시 요청
+            print(f"\n본문 가져오는 중: {len(filtered_articles)}개 (동시 {self.yonhap_workers}개)")
+            self.fetch_yonhap_summaries(filtered_articles)
+            
+            for i, article in enumerate(filtered_articles, 1):
+                print(f"\n📰 기사 {i} ({', '.join(article['sections'])}):")
+                print(f"제목: {article['title']}")
+                print(f"발행시간: {article['published']}")
+                print(f"링크: {article['link']}")
+                if article.get('related'):
+                    print(f"관련 기사: {len(article['related'])}개")
             
-            print(f"\n✅ 시간 범위 내 총 기사 수: {len(filtered_articles)}")
             return filtered_articles
             
         except Exception as e:
             print(f"❌ 연합뉴스 크롤링 실패: {e}")
             return []
 
-def main():
-    """메인 실행 함수"""
-    print("=== 일일 뉴스 크롤링 시작 ===")
-    
-    # 기존 크롤러 인스턴스 생성
-    crawler = NewsCrawler()
-    email_sender = NewsEmailSender()
+def crawl_foreign_news(foreign_sites, sequential=False, max_workers=FOREIGN_WORKERS, deadline=None):
+    """외신 헤드라인 크롤링 (기본 동시 실행, 결과는 foreign_sites 순서 유지, 사이트별 소요 시간은 metrics에 기록)
+
+    deadline이 지나도 끝나지 않은 사이트는 기다리지 않고 None으로 처리
+    """
+    def crawl_site(site_name, crawl_func):
+        print(f"\n{site_name} 크롤링 중...")
+        with metrics.span('crawl', site=site_name) as span:
+            try:
+                result = crawl_func()
+            except Exception as e:
+                print(f"{site_name} 크롤링 실패: {e}")
+                span['error'] = str(e)
+                result = None
+            span['items'] = 1 if result else 0
+        return result
+
+    foreign_news = {}
+    if sequential:
+        # 순차 모드: 기존 동작과 동일하게 사이트마다 2초 대기
+        for site_name, crawl_func in foreign_sites:
+            if deadline and deadline.expired():
+                print(f"⏰ {site_name} 마감 시각 초과 - 건너뜀")
+                foreign_news[site_name] = None
+                continue
+            foreign_news[site_name] = crawl_site(site_name, crawl_func)
+            time.sleep(2)
+    else:
+        workers = max(1, min(max_workers, len(foreign_sites)))
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = [(site_name, executor.submit(crawl_site, site_name, crawl_func))
+                       for site_name, crawl_func in foreign_sites]
+            done, _ = wait([future for _, future in futures],
+                           timeout=deadline.remaining() if deadline else None)
+            for site_name, future in futures:
+                if future in done:
+                    foreign_news[site_name] = future.result()
+                else:
+                    print(f"⏰ {site_name} 마감 시각 초과 - 결과 없이 진행")
+                    foreign_news[site_name] = None
+        finally:
+            # 멈춘 사이트를 기다리지 않음
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    return foreign_news
+
+def run_digest(crawler, email_sender, sequential=False, deadline_seconds=600, archive=None):
+    """크롤링 한 번 + 이메일 발송 (크롤링은 deadline_seconds 안에 끝내고 모은 결과로 발송, archive가 있으면 결과 보관)"""
+    metrics.reset()
+    deadline = crawler.start_run(deadline_seconds)
     
     # 외신 크롤링
-    foreign_news = {}
     foreign_sites = [
         ("BBC", crawler.crawl_bbc_headline),
         ("CNN", crawler.crawl_cnn_headline),
         ("Fox News", crawler.crawl_fox_headline),
         ("NYT", crawler.crawl_nyt_headline),
-        ("Washington Post", crawler.crawl_wp_headline_selenium)
+        ("Washington Post", crawler.crawl_wp_headline)
     ]
     
-    for site_name, crawl_func in foreign_sites:
+    foreign_start = time.perf_counter()
+    foreign_news = crawl_foreign_news(foreign_sites, sequential=sequential, deadline=deadline)
+    foreign_elapsed = time.perf_counter() - foreign_start
+    
+    # 연합뉴스 크롤링 (여기서는 목록만 - 본문은 이메일을 렌더링하면서 기사 순서대로 가져옴)
+    with metrics.span('crawl', site='연합뉴스') as span:
         try:
-            print(f"\n{site_name} 크롤링 중...")
-            result = crawl_func()
-            foreign_news[site_name] = result
-            time.sleep(2)
+            print(f"\n연합뉴스 크롤링 중...")
+            yonhap_listing = crawler.list_yonhap_articles()
         except Exception as e:
-            print(f"{site_name} 크롤링 실패: {e}")
-            foreign_news[site_name] = None
-    
-    # 연합뉴스 크롤링
-    try:
-        print(f"\n연합뉴스 크롤링 중...")
-        yonhap_articles = crawler.crawl_yonhap_request()
-    except Exception as e:
-        print(f"연합뉴스 크롤링 실패: {e}")
-        yonhap_articles = []
+            print(f"연합뉴스 크롤링 실패: {e}")
+            span['error'] = str(e)
+            yonhap_listing = []
+        if yonhap_listing:
+            yonhap_articles = crawler.iter_yonhap_summaries(yonhap_listing)
+        else:
+            # 목록을 못 가져왔으면 저장소에 모아 둔 기사로 발송 (데몬 모드의 미리 가져오기 결과 등)
+            yonhap_listing = yonhap_articles = crawler.load_yonhap_from_store()
+            if yonhap_listing:
+                print(f"저장소의 기사 {len(yonhap_listing)}개로 대체")
+        span['items'] = len(yonhap_listing)
     
     # 결과 요약
     print(f"\n=== 크롤링 결과 요약 ===")
     print(f"외신 성공: {sum(1 for v in foreign_news.values() if v)}/{len(foreign_news)}")
-    print(f"연합뉴스 기사: {len(yonhap_articles)}개")
+    print(f"연합뉴스 기사: {len(yonhap_listing)}개")
+    page_stats = crawler.yonhap_page_stats
+    print(f"연합뉴스 목록 페이지: {page_stats['useful']}/{page_stats['fetched']} 페이지 유효")
+    
+    print(f"외신 전체: {foreign_elapsed:.2f}초 ({'순차' if sequential else '동시'} 실행)")
+    
+    if crawler.stream_stats:
+        print(f"\n=== 헤드라인 스트리밍 ===")
+        for site, stats in crawler.stream_stats.items():
+            total = f"{stats['total']:,}B" if stats['total'] else "알 수 없음"
+            early = "조기 종료" if stats['stopped_early'] else "전체 수신"
+            print(f"{site}: {stats['read']:,}B / {total} ({early}, {stats['source']})")
+        saved = sum(stats['saved'] for stats in crawler.stream_stats.values())
+        print(f"절약한 전송량: {saved:,}B")
+    
+    # 재발송/주간 모음을 위해 기사가 렌더러로 흘러가는 동안 함께 보관 (실패해도 발송은 진행)
+    if archive:
+        yonhap_articles = archive.record(foreign_news, yonhap_articles)
     
-    # 이메일 발송
+    # 이메일 발송 (본문 요약 → 렌더링이 기사 하나씩 이어짐)
     print(f"\n이메일 발송 중...")
     success = email_sender.send_email(foreign_news, yonhap_articles)
+    # 발송이 중간에 끝났어도 남은 기사는 끝까지 받아 저장소/아카이브에 남김
+    deque(yonhap_articles, maxlen=0)
     
     if success:
         print("🎉 일일 뉴스 브리핑 완료!")
     else:
         print("❌ 이메일 발송 실패")
+    
+    metrics.print_summary()
+    return success
+
+def main(sequential=False, metrics_path='metrics.jsonl', deadline_seconds=600, http2=False,
+         yonhap_sections=('international',)):
+    """메인 실행 함수 (한 번 크롤링하고 발송한 뒤 종료)"""
+    print("=== 일일 뉴스 크롤링 시작 ===")
+    if metrics_path:
+        metrics.open(metrics_path)
+    
+    # 기존 크롤러 인스턴스 생성
+    crawler = NewsCrawler(http2=http2, yonhap_sections=yonhap_sections)
+    email_sender = NewsEmailSender()
+    
+    try:
+        run_digest(crawler, email_sender, sequential=sequential, deadline_seconds=deadline_seconds,
+                   archive=DigestArchive(ARCHIVE_PATH))
+    finally:
+        crawler.close()
+        metrics.close()
+
+def send_from_archive(start_date, end_date=None, archive_path=ARCHIVE_PATH):
+    """크롤링 없이 아카이브에 보관된 다이제스트 발송 (end_date가 있으면 기간 모음)"""
+    archive = DigestArchive(archive_path)
+    email_sender = NewsEmailSender()
+    try:
+        foreign_news, yonhap_articles = email_sender.digest_from_archive(archive, start_date, end_date)
+    except ValueError as e:
+        print(f"❌ 아카이브 발송 실패: {e}")
+        return False
+    if end_date:
+        subject = f"뉴스 브리핑 모음 - {start_date:%Y.%m.%d} ~ {end_date:%Y.%m.%d}"
+    else:
+        subject = f"일간 뉴스 브리핑 - {start_date:%Y.%m.%d} (재발송)"
+    print(f"아카이브에서 발송: 외신 {len(foreign_news)}개, 연합뉴스 {len(yonhap_articles)}개")
+    return email_sender.send_email(foreign_news, yonhap_articles, subject=subject)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="일일 뉴스 크롤러")
+    parser.add_argument('--sequential', action='store_true',
+                        help="외신 사이트를 순차적으로 크롤링 (기존 방식)")
+    parser.add_argument('--deadline', type=float, default=600,
+                        help="크롤링 제한 시간(초) - 지나면 모은 결과로 바로 이메일 발송")
+    parser.add_argument('--http2', action='store_true',
+                        help="httpx 기반 HTTP/2 전송 사용 (httpx[http2] 필요, 디스크 캐시는 사용 안 함)")
+    parser.add_argument('--sections', default='international',
+                        help=f"수집할 연합뉴스 섹션 (쉼표로 구분: {', '.join(YONHAP_SECTIONS)})")
+    parser.add_argument('--serve', action='store_true',
+                        help="데몬 모드: 프로세스를 유지하며 매일 --send-at 시각(KST)에 발송")
+    parser.add_argument('--send-at', default='08:30',
+                        help="데몬 모드 발송 시각 (KST, HH:MM)")
+    parser.add_argument('--poll-interval', type=float, default=900,
+                        help="데몬 모드에서 밤사이 연합뉴스를 미리 가져오는 간격(초), 0이면 사용 안 함")
+    parser.add_argument('--from-archive', type=date.fromisoformat, metavar='YYYY-MM-DD',
+                        help="크롤링 없이 아카이브에 보관된 그날 다이제스트를 다시 발송")
+    parser.add_argument('--until', type=date.fromisoformat, metavar='YYYY-MM-DD',
+                        help="--from-archive와 함께 쓰면 기간 내 기사를 모아 발송 (주간 모음 등)")
+    args = parser.parse_args()
+    sections = [section.strip() for section in args.sections.split(',') if section.strip()]
+    if args.from_archive:
+        if not send_from_archive(args.from_archive, args.until):
+            sys.exit(1)
+    elif args.serve:
+        from daemon import serve
+        hour, minute = (int(part) for part in args.send_at.split(':'))
+        serve(sequential=args.sequential, deadline_seconds=args.deadline, http2=args.http2,
+              yonhap_sections=sections, send_at=(hour, minute), poll_interval=args.poll_interval)
+    else:
+        main(sequential=args.sequential, deadline_seconds=args.deadline, http2=args.http2,
+             yonhap_sections=sections)
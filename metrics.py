@@ -0,0 +1,100 @@
+# metrics.py
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+
+class Metrics:
+    """단계별 소요 시간/전송량/상태를 JSON Lines 파일로 기록하고 실행 끝에 요약"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._file = None
+        self.records = []
+        # False이면 기록하지 않음 (disabled() 참고)
+        self.enabled = True
+
+    def open(self, path):
+        """기록 파일 열기 (열지 않으면 메모리에만 쌓음)"""
+        self.close()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def reset(self):
+        """쌓인 기록 비우기 (데몬 모드에서 실행마다 요약을 새로 시작할 때)"""
+        with self._lock:
+            self.records = []
+
+    @contextmanager
+    def disabled(self):
+        """블록 안에서는 기록하지 않음 (벤치마크의 메모리 측정에 기록이 섞이지 않도록)"""
+        enabled, self.enabled = self.enabled, False
+        try:
+            yield
+        finally:
+            self.enabled = enabled
+
+    def record(self, stage, **fields):
+        """기록 한 줄 추가"""
+        if not self.enabled:
+            return
+        record = {'ts': datetime.now(timezone.utc).isoformat(), 'stage': stage}
+        record.update(fields)
+        with self._lock:
+            self.records.append(record)
+            if self._file:
+                self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+                self._file.flush()
+
+    @contextmanager
+    def span(self, stage, **fields):
+        """with 블록의 소요 시간 기록 (블록 안에서 span['bytes'] 등 필드 추가 가능, 예외는 error로 기록 후 전달)"""
+        span = dict(fields)
+        start = time.perf_counter()
+        try:
+            yield span
+        except Exception as e:
+            span['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span['duration_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            self.record(stage, **span)
+
+    def summary(self):
+        """(단계, 사이트)별 횟수/총 시간/최대 시간/바이트/항목 수/오류 수 집계"""
+        rows = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            key = (record['stage'], record.get('site', '-'))
+            row = rows.setdefault(key, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                                        'bytes': 0, 'items': 0, 'retries': 0, 'errors': 0})
+            duration = record.get('duration_ms', 0.0)
+            row['count'] += 1
+            row['total_ms'] += duration
+            row['max_ms'] = max(row['max_ms'], duration)
+            row['bytes'] += record.get('bytes') or 0
+            row['items'] += record.get('items') or 0
+            row['retries'] += record.get('retries') or 0
+            row['errors'] += 1 if record.get('error') else 0
+        return rows
+
+    def print_summary(self):
+        """실행 끝에 출력하는 단계별 요약 표"""
+        rows = self.summary()
+        print(f"\n=== 단계별 소요 시간 ===")
+        print(f"{'단계':<14}{'사이트':<18}{'횟수':>6}{'총(ms)':>12}{'최대(ms)':>12}{'바이트':>12}{'항목':>6}{'재시도':>6}{'오류':>6}")
+        for (stage, site), row in sorted(rows.items(), key=lambda item: -item[1]['total_ms']):
+            print(f"{stage:<14}{site:<18}{row['count']:>6}{row['total_ms']:>12.1f}{row['max_ms']:>12.1f}"
+                  f"{row['bytes']:>12,}{row['items']:>6}{row['retries']:>6}{row['errors']:>6}")
+
+
+# 프로세스 전체에서 함께 쓰는 기록기 (main에서 metrics.open으로 파일 지정)
+metrics = Metrics()
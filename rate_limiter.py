@@ -0,0 +1,45 @@
+# rate_limiter.py
+import threading
+import time
+from urllib.parse import urlparse
+
+
+class HostRateLimiter:
+    """호스트별 요청 간격 제한 (서로 다른 호스트는 서로를 기다리지 않음)"""
+
+    def __init__(self, min_interval=2.0, host_intervals=None):
+        self.min_interval = min_interval
+        self.host_intervals = dict(host_intervals or {})
+        self._lock = threading.Lock()
+        self._next_allowed = {}
+
+    def wait(self, url):
+        """같은 호스트에 대한 직전 요청으로부터 호스트별 간격만큼 대기"""
+        host = urlparse(url).netloc
+        interval = self.host_intervals.get(host, self.min_interval)
+        if interval <= 0:
+            return
+
+        with self._lock:
+            # 슬롯을 먼저 예약해 두고 락 밖에서 대기 (동시 요청도 순서대로 간격 유지)
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(host, 0.0))
+            self._next_allowed[host] = slot + interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def try_acquire(self, url):
+        """같은 호스트에 지금 바로 보낼 수 있으면 슬롯을 예약하고 True (기다려야 하면 예약 없이 False)"""
+        host = urlparse(url).netloc
+        interval = self.host_intervals.get(host, self.min_interval)
+        if interval <= 0:
+            return True
+
+        with self._lock:
+            now = time.monotonic()
+            if self._next_allowed.get(host, 0.0) > now:
+                return False
+            self._next_allowed[host] = now + interval
+        return True
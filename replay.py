@@ -0,0 +1,98 @@
+# replay.py
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+INDEX_FILE = 'index.json'
+
+# 재생 시 돌려줄 응답 헤더
+RECORDED_HEADERS = ('Content-Type', 'Content-Length', 'ETag', 'Last-Modified')
+
+
+def snapshot_filename(url):
+    """URL별 스냅샷 파일 이름"""
+    return hashlib.sha1(url.encode('utf-8')).hexdigest() + '.html'
+
+
+def load_index(snapshot_dir):
+    """스냅샷 인덱스 읽기 (없으면 빈 인덱스)"""
+    path = os.path.join(snapshot_dir, INDEX_FILE)
+    if not os.path.exists(path):
+        return {'recorded_at': None, 'pages': {}}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class RecordingSession(requests.Session):
+    """실제로 요청하면서 응답 본문을 스냅샷 디렉터리에 저장하는 Session"""
+
+    def __init__(self, snapshot_dir):
+        super().__init__()
+        self.snapshot_dir = snapshot_dir
+        os.makedirs(snapshot_dir, exist_ok=True)
+        self.index = load_index(snapshot_dir)
+        self.index['recorded_at'] = datetime.now().astimezone().isoformat()
+        self._lock = threading.Lock()
+
+    def request(self, method, url, *args, **kwargs):
+        # 스트리밍 중간에 끊으면 일부만 저장되므로 기록할 때는 항상 전체를 받음
+        kwargs.pop('stream', None)
+        response = super().request(method, url, *args, **kwargs)
+        if method.upper() == 'GET' and response.status_code == 200:
+            self.save(url, response)
+        return response
+
+    def save(self, url, response):
+        """응답 본문과 주요 헤더 저장"""
+        filename = snapshot_filename(url)
+        with open(os.path.join(self.snapshot_dir, filename), 'wb') as f:
+            f.write(response.content)
+        with self._lock:
+            self.index['pages'][url] = {
+                'file': filename,
+                'headers': {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers},
+            }
+            with open(os.path.join(self.snapshot_dir, INDEX_FILE), 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, ensure_ascii=False, indent=2)
+
+
+class ReplaySession(requests.Session):
+    """저장된 스냅샷으로만 응답하는 Session (네트워크 사용 안 함)"""
+
+    def __init__(self, snapshot_dir):
+        super().__init__()
+        self.snapshot_dir = snapshot_dir
+        self.index = load_index(snapshot_dir)
+
+    def has(self, url):
+        return url in self.index['pages']
+
+    def urls(self, prefix=''):
+        """기록된 URL 목록 (prefix로 필터)"""
+        return [url for url in self.index['pages'] if url.startswith(prefix)]
+
+    def body(self, url):
+        """기록된 본문 바이트"""
+        page = self.index['pages'][url]
+        with open(os.path.join(self.snapshot_dir, page['file']), 'rb') as f:
+            return f.read()
+
+    def request(self, method, url, *args, **kwargs):
+        if url not in self.index['pages']:
+            raise requests.ConnectionError(f"스냅샷 없음: {url}")
+
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = url
+        response.headers = CaseInsensitiveDict(self.index['pages'][url]['headers'])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        # 이미 읽은 본문으로 표시해 두면 iter_content도 이 본문을 잘라서 돌려줌
+        response._content = self.body(url)
+        response._content_consumed = True
+        return response
@@ -0,0 +1,135 @@
+# story_clusters.py
+"""연합뉴스 제목 유사도(MinHash + 밴드 LSH)로 같은 기사의 속보/갱신판 묶기
+
+    "美 연준 기준금리 동결(1보)", "美 연준 기준금리 동결…파월 \"서두르지 않아\"(종합)" → 한 묶음
+"""
+import hashlib
+import random
+import re
+
+# MinHash 서명 길이와 밴드 (2개씩 24밴드 - 자카드 0.35 이상인 쌍은 96% 이상 후보가 됨)
+NUM_HASHES = 48
+ROWS_PER_BAND = 2
+# 후보 쌍 확인 기준: 두 제목(또는 첫 구절)의 글자 n-gram 자카드 유사도가 이 값 이상이면 같은 기사
+# (한쪽 기준 포함률은 "소비자물가/생산자물가"처럼 한 단어만 다른 기사까지 묶으므로 쓰지 않음)
+MIN_SIMILARITY = 2 / 3
+MIN_SHARED = 3
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20250907)
+_HASH_PARAMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_HASHES)]
+
+# 같은 기사의 갱신판에 붙는 표시 (제목 비교 전에 제거)
+UPDATE_MARKERS = re.compile(r'\((?:\d+보|종합\d*보?|속보|LEAD|2nd LD)\)|\[(?:속보|\d+보|종합\d*보?)\]')
+# 그 밖의 [그래픽], [사진], [영상], [팩트체크] 등은 기사 종류 - 종류가 다르면 같은 기사로 보지 않음
+CONTENT_TAGS = re.compile(r'\[([^\]]+)\]')
+# 종합판은 "첫 구절…덧붙인 내용" 형태로 길어지므로 첫 구절끼리도 비교
+LEAD_SEPARATOR = re.compile(r'…|\.\.\.')
+NUMBERS = re.compile(r'\d+(?:\.\d+)?')
+NON_WORD = re.compile(r'[^\w]+')
+
+
+def normalize_title(title):
+    """갱신 표시와 문장부호를 없애고 공백을 정리한 제목"""
+    title = UPDATE_MARKERS.sub(' ', title)
+    return NON_WORD.sub(' ', title).strip().lower()
+
+
+def title_shingles(title, size=2):
+    """제목의 글자 n-gram 집합 (한국어는 조사가 붙어 단어 단위보다 글자 단위가 안정적)"""
+    shingles = set()
+    for word in normalize_title(title).split():
+        if len(word) <= size:
+            shingles.add(word)
+        else:
+            shingles.update(word[i:i + size] for i in range(len(word) - size + 1))
+    return shingles
+
+
+def minhash(shingles):
+    """n-gram 집합의 MinHash 서명 (NUM_HASHES개)"""
+    values = [int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+              for shingle in shingles]
+    return tuple(min((a * value + b) % _PRIME for value in values) for a, b in _HASH_PARAMS)
+
+
+def title_features(title):
+    """같은 기사 판단에 쓰는 (기사 종류 태그, 제목 n-gram, 첫 구절 n-gram, 숫자)"""
+    title = UPDATE_MARKERS.sub(' ', title)
+    tags = frozenset(CONTENT_TAGS.findall(title))
+    title = CONTENT_TAGS.sub(' ', title)
+    lead = LEAD_SEPARATOR.split(title, 1)[0]
+    return tags, title_shingles(title), title_shingles(lead), frozenset(NUMBERS.findall(title))
+
+
+def _jaccard(a, b):
+    shared = len(a & b)
+    return shared / len(a | b) if shared >= MIN_SHARED else 0.0
+
+
+def _same_story(a, b):
+    tags_a, shingles_a, lead_a, numbers_a = a
+    tags_b, shingles_b, lead_b, numbers_b = b
+    if tags_a != tags_b:
+        return False
+    # "드론 100대 격추" / "드론 50대 격추"처럼 숫자가 어긋나면 다른 기사 (종합판에 숫자가 더해지는 것은 허용)
+    if not (numbers_a <= numbers_b or numbers_b <= numbers_a):
+        return False
+    return max(_jaccard(shingles_a, shingles_b), _jaccard(lead_a, lead_b)) >= MIN_SIMILARITY
+
+
+def cluster_titles(titles):
+    """제목 목록을 유사 묶음으로 나눠 인덱스 목록의 목록으로 반환 (입력 순서 유지)
+
+    같은 밴드 값을 가진 제목끼리만 후보로 비교하므로 전체 쌍을 비교하지 않음 (거의 선형 시간)
+    """
+    features = [title_features(title) if title else None for title in titles]
+    parent = list(range(len(titles)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = {}
+    for i, feature in enumerate(features):
+        if feature is None or not feature[1]:
+            continue
+        signature = minhash(feature[1])
+        for start in range(0, NUM_HASHES, ROWS_PER_BAND):
+            key = (start, signature[start:start + ROWS_PER_BAND])
+            for j in buckets.get(key, ()):
+                if find(i) != find(j) and _same_story(feature, features[j]):
+                    parent[find(i)] = find(j)
+            buckets.setdefault(key, []).append(i)
+
+    clusters = {}
+    for i in range(len(titles)):
+        clusters.setdefault(find(i), []).append(i)
+    return list(clusters.values())
+
+
+def merge_story_updates(articles):
+    """같은 기사의 갱신판을 최신 기사 하나로 합침 (나머지는 related, 섹션 태그는 합침)
+
+    본문은 대표 기사만 가져오면 되므로 본문 요청 전에 호출
+    """
+    merged = []
+    for members in cluster_titles([article['title'] for article in articles]):
+        group = [articles[i] for i in members]
+        # 발행 시각이 같으면 목록에서 먼저 나온(더 최근에 올라온) 기사
+        newest = max(group, key=lambda article: (article['published'] is not None, article['published']))
+        others = [article for article in group if article is not newest]
+        if others:
+            newest['related'] = [{'title': article['title'], 'link': article['link'],
+                                  'published': article['published']} for article in others]
+            if newest.get('sections') is not None:
+                for article in others:
+                    for label in article.get('sections') or []:
+                        if label not in newest['sections']:
+                            newest['sections'].append(label)
+        merged.append((members[0], newest))
+    # 묶음의 첫 기사 위치에 대표 기사를 둠 (원래 목록 순서 유지)
+    merged.sort(key=lambda item: item[0])
+    return [article for _, article in merged]